@@ -9,7 +9,9 @@ yes | pkg update
 yes | pkg upgrade
 yes | pkg i python
 yes | pkg i python-pip
+yes | pkg i python-pillow
 pip install requests rich prettytable pytz
 export CFLAGS="-Wno-error=implicit-function-declaration"
 pip install psutil
 curl -Ls "https://cdn.jsdelivr.net/gh/FuzyTVSadBoy1337/GPT-setup@main/GPT-Tool-v2.py" -o /sdcard/Download/GPT-Tool-v2.py
+curl -Ls "https://cdn.jsdelivr.net/gh/FuzyTVSadBoy1337/GPT-setup@main/gpt_tool.py" -o /sdcard/Download/gpt_tool.py
@@ -0,0 +1,3968 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os, sys, time, json, threading, queue, subprocess, re, select, struct, heapq, hashlib, io, math, importlib, random
+from collections import deque
+from datetime import datetime, timezone
+
+start_time = datetime.now()   # uptime shown in reports
+
+# Optional libs: imported on first use (webhook / telemetry / screenshots / event store), not at startup
+_optional = {}
+
+def optional_import(name):
+    # module or None; success and failure are both cached
+    if name not in _optional:
+        try:
+            _optional[name] = importlib.import_module(name)
+        except Exception:
+            _optional[name] = None
+    return _optional[name]
+
+# --- Paths & defaults ---
+WORKDIR = "/sdcard/Download/GPT-Tool"   # local workspace for screenshots etc
+CONFIG_FILE = os.path.join(WORKDIR, "configs.json")
+ACCOUNTS_FILE = os.path.join(WORKDIR, "accounts.json")
+TELEMETRY_FILE = os.path.join(WORKDIR, "telemetry.jsonl")   # per-instance resource time series
+TELEMETRY_MAX_BYTES = 2 * 1024 * 1024
+OUTBOX_DIR = os.path.join(WORKDIR, "outbox")   # persistent webhook queue
+STATE_FILE = os.path.join(WORKDIR, "monitor_state.json")   # RejoinMonitor checkpoint
+LATENCY_FILE = os.path.join(WORKDIR, "latency.json")        # rejoin latency histograms
+EVENTS_DB = os.path.join(WORKDIR, "events.db")               # status history (sqlite, WAL)
+CONTROL_SOCKET = os.path.join(os.environ.get("TMPDIR") or "/tmp", "gpt-tool.sock")   # daemon control
+DAEMON_LOG = os.path.join(WORKDIR, "daemon.log")
+RULES_FILE = os.path.join(WORKDIR, "rules.json")             # severity rules -> actions
+
+# Executor base paths
+MULTI_EXEC_WS = [
+    "/sdcard/Fluxus",
+    "/sdcard/Codex",
+    "/sdcard/Arceus X",
+    "/sdcard/Cryptic",
+    "/sdcard/Delta",
+    "/sdcard/RonixExploit",
+]
+
+# Build AUTOEXEC_DIRS
+AUTOEXEC_DIRS = []
+for _ws in MULTI_EXEC_WS:
+    AUTOEXEC_DIRS.extend([
+        os.path.join(_ws, "autoexec"),
+        os.path.join(_ws, "Autoexec"),
+    ])
+
+# Build WORKSPACE_DIRS
+WORKSPACE_DIRS = []
+for _ws in MULTI_EXEC_WS:
+    WORKSPACE_DIRS.extend([
+        os.path.join(_ws, "workspace"),
+        os.path.join(_ws, "Workspace"),
+    ])
+
+REPORT_DIRNAME = "Rejoin Report"
+LUA_FILENAME = "rejoin_autoexec.lua"
+# default config
+# Use a sane single default exec workspace (string) — code elsewhere may expect string by default.
+DEFAULT_EXEC_WS = MULTI_EXEC_WS[-1] if MULTI_EXEC_WS else "/sdcard/RonixExploit"
+
+DEFAULT_CONFIG = {
+    "package_prefix": "com.roblox",
+    "exec_workspace": DEFAULT_EXEC_WS,
+    "webhook_url": "",
+    "device_name": "GPT-Tool Device",
+    # default ChatGPT-ish icon (changeable)
+    "icon_url": "https://i.imgur.com/kOeJ8zr.png",
+    "report_interval_min": 10,      # minutes
+    "first_rejoin_delay": 30,       # seconds (first rejoin per UID)
+    "heartbeat_stale": 45,          # seconds
+    "send_screenshot": True,
+    "screenshot_path": os.path.join(WORKDIR, "screenshot.png"),
+    "screenshot_mode": "stream",    # stream: raw screencap via pipe -> downscale/encode (needs Pillow); file: PNG on disk
+    "screenshot_format": "jpeg",    # jpeg | webp (stream mode)
+    "screenshot_quality": 70,
+    "screenshot_max_width": 720,
+    "screenshot_skip_unchanged": True,
+    "status_format": "json",        # lua heartbeat record format: json | compact
+    "log_max_kb": 256,              # rotate status_<UID>.log past this size ...
+    "log_max_age_h": 24,            # ... or after this many hours (0 = no age limit)
+    "log_keep_segments": 1,         # rotated segments kept (status_<UID>.log.1 ...)
+    "checkpoint_interval": 30,      # seconds between monitor state checkpoints
+    "root_shell_pool": 2,           # persistent su shells for am/monkey/settings (0 = su -c per command)
+    "metrics_port": 0,              # OpenMetrics HTTP endpoint port (0 = disabled)
+    "metrics_bind": "127.0.0.1",    # use 0.0.0.0 to let a LAN Prometheus scrape this phone
+    "event_store": True,            # keep status records / rejoins / launch outcomes in events.db
+    "event_retention_days": 7,      # older rows are deleted and their pages vacuumed
+    "log_rescan_interval": 5,       # seconds between full log stat sweeps (safety net for inotify)
+    "rejoin_workers": 3,            # fixed rejoin worker pool size
+    "max_parallel_launches": 2,     # cap on simultaneous force-stop/launch sequences
+    "launch_stagger": 3,            # seconds between two launch starts (spreads mass rejoins)
+    "rejoin_jitter": [3, 8],        # seconds, random delay for non-first rejoins
+    "breaker_failures": 3,          # relaunches without a healthy run before a UID is paused (0 = off)
+    "breaker_window": 900,          # seconds; older failed relaunches are forgotten
+    "breaker_healthy": 120,         # seconds of RUNNING heartbeats that count as a healthy run
+    "breaker_backoff": [60, 3600],  # first pause, max pause (doubles on every failed probe)
+    "admission_min_free_mb": 600,   # hold relaunches until this much RAM is available (0 = off)
+    "admission_swap_weight": 0.25,  # share of free swap counted as headroom
+    "admission_max_psi": 30.0,      # hold while memory PSI "some avg10" is above this % (0 = ignore)
+    "admission_max_hold": 300,      # seconds; a held relaunch goes ahead anyway after this
+    "trim_background": False,       # am send-trim-memory to background clones while relaunches are held
+    "cold_start": True,             # launch accounts whose package is not running when the monitor starts
+    "cold_start_batch": 2,          # clients launching at once until their first heartbeat
+    "cold_start_timeout": 180,      # seconds to wait for a first heartbeat before moving on
+    "affinity_policy": "off",       # off / big (all clones on big cores) / round_robin / priority
+    "affinity_cores_per_clone": 2,  # core group size for round_robin / priority
+    "clone_nice": 0,                # nice for clone threads after each launch (0 = leave as is)
+    "clone_ionice": [],             # [class, level] e.g. [2, 0]; empty = leave as is
+    "monitor_little_cores": False,  # pin this tool's threads to the little cores
+}
+
+# Rejoin behavior constants (fallbacks; values read from config at runtime too)
+DEFAULT_HEARTBEAT_INTERVAL = 20   # lua heartbeat period
+DEFAULT_REJOIN_COOLDOWN = 20      # seconds between rejoins for same UID
+
+# utility
+def ensure_dir(p):
+    if not p:
+        return
+    try:
+        os.makedirs(p, exist_ok=True)
+    except Exception:
+        pass
+
+def sh(cmd, root=False, timeout=30):
+    # root=True runs cmd through the persistent root shell pool instead of forking su
+    if root:
+        return root_run(cmd, timeout)[0]
+    try:
+        return subprocess.call(cmd, shell=True)
+    except Exception:
+        return -1
+
+def shout(cmd, root=False, timeout=30):
+    if root:
+        return root_run(cmd, timeout)[1]
+    try:
+        return subprocess.getoutput(cmd)
+    except Exception:
+        return ""
+
+# --- Persistent root shell: long-lived su over pipes, sentinel-delimited output ---
+class RootShell:
+    def __init__(self, argv=("su",)):
+        self.argv = list(argv)
+        self.proc = None
+        self.buf = b""
+        self.lock = threading.Lock()
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def _spawn(self):
+        self.proc = subprocess.Popen(self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT, bufsize=0)
+        self.buf = b""
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.kill()
+                self.proc.wait(timeout=2)
+            except Exception:
+                pass
+        self.proc = None
+
+    def run(self, cmd, timeout=30):
+        # returns (exit code, output); OSError if su can't be started, TimeoutError on timeout
+        with self.lock:
+            if not self.alive():
+                self._spawn()
+                self._exchange("true", 15)   # probe: su denied/missing raises here
+            try:
+                return self._exchange(cmd, timeout)
+            except TimeoutError:
+                raise
+            except OSError:
+                return -1, ""   # shell died mid-command; respawned on next call
+
+    def _exchange(self, cmd, timeout):
+        marker = f"__GPT_RC_{os.urandom(6).hex()}__".encode()
+        script = f"{{ {cmd}\n}} </dev/null 2>&1\nprintf '\\n%s %d\\n' {marker.decode()} $?\n"
+        try:
+            self.proc.stdin.write(script.encode("utf-8"))
+            self.proc.stdin.flush()
+        except OSError:
+            self.close()
+            raise
+        fd = self.proc.stdout.fileno()
+        end = time.monotonic() + timeout
+        while True:
+            i = self.buf.find(b"\n" + marker + b" ")
+            if i >= 0:
+                j = self.buf.find(b"\n", i + len(marker) + 2)
+                if j >= 0:
+                    try:
+                        rc = int(self.buf[i + len(marker) + 2:j])
+                    except ValueError:
+                        rc = -1
+                    out = self.buf[:i].decode("utf-8", "ignore")
+                    self.buf = self.buf[j + 1:]
+                    return rc, out
+            left = end - time.monotonic()
+            if left <= 0:
+                self.close()
+                raise TimeoutError(f"root shell timeout: {cmd}")
+            r, _, _ = select.select([fd], [], [], left)
+            if r:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    self.close()
+                    raise OSError("root shell exited")
+                self.buf += chunk
+
+class RootShellPool:
+    RETRY_AFTER = 60   # seconds before trying to spawn su again after it failed
+
+    def __init__(self, size=2, argv=("su",)):
+        self.idle = queue.Queue()
+        for _ in range(max(1, int(size))):
+            self.idle.put(RootShell(argv))
+        self.broken_until = 0.0
+
+    def run(self, cmd, timeout=30):
+        if time.time() < self.broken_until:
+            return None
+        shell = self.idle.get()
+        try:
+            return shell.run(cmd, timeout)
+        except TimeoutError as e:
+            print("[!]", e)
+            return -1, ""
+        except OSError as e:
+            print("[!] root shell unavailable, falling back to su -c:", e)
+            self.broken_until = time.time() + self.RETRY_AFTER
+            return None
+        finally:
+            self.idle.put(shell)
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_root_pool = None
+_root_pool_lock = threading.Lock()
+
+def get_root_pool():
+    global _root_pool
+    with _root_pool_lock:
+        if _root_pool is None:
+            size = int(load_config().get("root_shell_pool", DEFAULT_CONFIG["root_shell_pool"]) or 0)
+            _root_pool = RootShellPool(size) if size > 0 else False
+        return _root_pool
+
+def root_run(cmd, timeout=30):
+    # (rc, output) as root; one su fork per call only when the pool is off or broken
+    pool = get_root_pool()
+    res = pool.run(cmd, timeout) if pool else None
+    if res is not None:
+        return res
+    try:
+        p = subprocess.run(["su", "-c", cmd], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout)
+        return p.returncode, p.stdout.decode("utf-8", "ignore")
+    except Exception as e:
+        return -1, str(e)
+
+def load_json(path, default=None):
+    try:
+        if not os.path.exists(path):
+            return default if default is not None else {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default if default is not None else {}
+
+def write_atomic(path, data):
+    # write to a temp file in the same dir, then rename over the target
+    ensure_dir(os.path.dirname(path))
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        try:
+            os.fsync(f.fileno())
+        except OSError:
+            pass
+    os.replace(tmp, path)
+
+def save_json(path, data):
+    write_atomic(path, json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+# --- Cached JSON store: reparse only when the file's mtime/size changes ---
+class JsonStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.sig = None      # (mtime_ns, size) the cache was read at
+        self.data = None     # last good parse, shared read-only: callers copy before mutating
+        self.bad_sig = None  # signature of a file that failed to parse (not re-read until it changes)
+        self.error = None    # why the file on disk is not the cached data, None when it is
+        self.listeners = []
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _refresh(self):
+        # caller holds the lock; returns True if the content changed
+        sig = self._stat()
+        if self.data is not None and (sig == self.sig or (sig is not None and sig == self.bad_sig)):
+            return False
+        data = {}
+        if sig is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("not a JSON object")
+            except (OSError, ValueError) as e:
+                # half-written or broken edit: keep serving the last good copy, tell nobody
+                if sig != self.bad_sig:
+                    print(f"[!] {self.path} unreadable, keeping the last good copy: {e}")
+                self.bad_sig = sig
+                self.error = str(e)
+                if self.data is None:
+                    self.data = {}
+                return False
+        self.bad_sig = None
+        self.error = None
+        changed = data != self.data
+        self.data = data
+        self.sig = sig
+        return changed
+
+    def get(self):
+        # the cached dict itself, not a copy (hot path); load_config/load_accounts and the
+        # monitor's listeners copy it before changing anything
+        with self.lock:
+            self._refresh()
+            return self.data
+
+    def save(self, data):
+        # atomic write, skipped when nothing changed; returns True if written
+        text = json.dumps(data, indent=2, ensure_ascii=False)
+        with self.lock:
+            self._refresh()
+            if self.sig is not None and json.loads(text) == self.data:
+                return False
+            write_atomic(self.path, text.encode("utf-8"))
+            self.data = json.loads(text)
+            self.sig = self._stat()
+            self.bad_sig = self.error = None
+            snapshot = self.data
+        self._notify(snapshot)
+        return True
+
+    def subscribe(self, fn):
+        self.listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        try:
+            self.listeners.remove(fn)
+        except ValueError:
+            pass
+
+    def poll(self):
+        # watch hook: reload if the file changed on disk and tell subscribers
+        with self.lock:
+            changed = self._refresh()
+            snapshot = self.data
+        if changed:
+            self._notify(snapshot)
+        return changed
+
+    def _notify(self, data):
+        for fn in list(self.listeners):
+            try:
+                fn(data)
+            except Exception as e:
+                print(f"[!] {os.path.basename(self.path)} listener error:", e)
+
+CONFIG_STORE = JsonStore(CONFIG_FILE)
+ACCOUNTS_STORE = JsonStore(ACCOUNTS_FILE)
+RULES_STORE = JsonStore(RULES_FILE)
+
+# config/accounts
+def load_config():
+    cfg = CONFIG_STORE.get()
+    merged = DEFAULT_CONFIG.copy()
+    merged.update(cfg or {})
+    # normalize numeric fields
+    try:
+        merged["report_interval_min"] = int(merged.get("report_interval_min", DEFAULT_CONFIG["report_interval_min"]))
+    except Exception:
+        merged["report_interval_min"] = DEFAULT_CONFIG["report_interval_min"]
+    try:
+        merged["first_rejoin_delay"] = int(merged.get("first_rejoin_delay", DEFAULT_CONFIG["first_rejoin_delay"]))
+    except Exception:
+        merged["first_rejoin_delay"] = DEFAULT_CONFIG["first_rejoin_delay"]
+    try:
+        merged["heartbeat_stale"] = int(merged.get("heartbeat_stale", DEFAULT_CONFIG["heartbeat_stale"]))
+    except Exception:
+        merged["heartbeat_stale"] = DEFAULT_CONFIG["heartbeat_stale"]
+    return merged
+
+def save_config(cfg):
+    if CONFIG_STORE.save(cfg):
+        print(f"[✓] Saved config to {CONFIG_FILE}")
+
+def load_accounts():
+    # copies, so callers can edit before save_accounts()
+    return {uid: dict(info) if isinstance(info, dict) else info for uid, info in ACCOUNTS_STORE.get().items()}
+
+def save_accounts(accounts):
+    if ACCOUNTS_STORE.save(accounts):
+        print(f"[✓] Saved {len(accounts)} accounts to {ACCOUNTS_FILE}")
+
+# --- Read username and userid from pkg appStorage.json ---
+def read_user_from_appStorage(pkg_name):
+    path = f"/data/data/{pkg_name}/files/appData/LocalStorage/appStorage.json"
+    if not os.path.exists(path):
+        return None, None
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            raw = f.read()
+        return _parse_appStorage(raw)
+    except Exception as e:
+        print(f"[!] Error reading {path}: {e}")
+    return None, None
+
+def _parse_appStorage(raw):
+    # Thử parse JSON chuẩn
+    try:
+        data = json.loads(raw)
+        # Try common keys, be tolerant to case
+        uid = data.get("UserId") or data.get("userId") or data.get("userid") or data.get("uid")
+        uname = data.get("Username") or data.get("username") or data.get("name")
+        if uid is not None and str(uid).isdigit():
+            return (str(uname) if uname else None), str(uid)
+    except Exception:
+        # Nếu file không phải JSON thuần thì dùng regex
+        uid_match = re.search(r'"UserId"\s*:\s*"?(\d+)"?', raw, flags=re.I)
+        if not uid_match:
+            uid_match = re.search(r'"userId"\s*:\s*"?(\d+)"?', raw, flags=re.I)
+        uname_match = re.search(r'"Username"\s*:\s*"([^"]+)"', raw, flags=re.I) or re.search(r'"username"\s*:\s*"([^"]+)"', raw, flags=re.I)
+        uid = uid_match.group(1) if uid_match else None
+        uname = uname_match.group(1) if uname_match else None
+        return uname, uid
+    return None, None
+
+# --- Lua autoexec content (writes to workspace/status_<UID>.log) ---
+LUA_SCRIPT = r'''-- rejoin_autoexec.lua (auto-generated)
+local HttpService = game:GetService("HttpService")
+local Players = game:GetService("Players")
+local CoreGui = game:GetService("CoreGui")
+local RunService = game:GetService("RunService")
+local TeleportService = game:GetService("TeleportService")
+
+local player = Players.LocalPlayer
+local username = (player and player.Name) or ("unknown_" .. tostring(math.random(1000,9999)))
+local userid = (player and player.UserId) or 0
+local logfile = "workspace/status_" .. tostring(userid) .. ".log"
+local rotatefile = "workspace/status_" .. tostring(userid) .. ".rotate"
+local STATUS_FORMAT = "__STATUS_FORMAT__"
+
+-- severity rules (generated from rules.json): first match wins; the monitor trusts ri/rv of this version
+local RULES_VERSION = "__RULES_VERSION__"
+local DEFAULT_ACTION = "__DEFAULT_ACTION__"
+local RULES = __RULES__
+local rule_cache = {}
+
+local function rule_msg(lower, needles)
+  for _, n in ipairs(needles) do
+    if string.find(lower, n, 1, true) then return true end
+  end
+  return false
+end
+
+local function classify(event, code, severity, msg)
+  event, code, severity = string.upper(tostring(event or "")), string.upper(tostring(code or "")), string.upper(tostring(severity or ""))
+  msg = string.lower(tostring(msg or ""))
+  local key = event .. "\31" .. severity .. "\31" .. code
+  if msg == "" and rule_cache[key] then return rule_cache[key] end
+  local ri = -1
+  for i, r in ipairs(RULES) do
+    if r.opaque then return nil end -- regex rule: leave it to the monitor
+    if (not r.event or r.event[event]) and (not r.severity or r.severity[severity])
+      and (not r.code or string.sub(code, 1, #r.code) == r.code)
+      and (not r.code_has or string.find(code, r.code_has, 1, true))
+      and (not r.msg or rule_msg(msg, r.msg)) then
+      ri = i - 1
+      break
+    end
+  end
+  if msg == "" then rule_cache[key] = ri end
+  return ri
+end
+
+local function jencode(t)
+  local ok, s = pcall(function() return HttpService:JSONEncode(t) end)
+  return ok and s or nil
+end
+
+-- compact record: ~1|t|event|severity|code|fps|msg|ri@rv (event/severity as small ints)
+local EV = {RUNNING=0, ERROR=1, KICK=2, CRASH=3, DISCONNECT=4, TELEPORT_BEGIN=5, TELEPORT_END=6}
+local SV = {INFO=0, MINOR=1, SEVERE=2}
+local function clean(v)
+  return (string.gsub(tostring(v or ""), "[|\r\n]", " "))
+end
+local function cencode(event, code, severity, details, ri)
+  details = details or {}
+  local fps = details.fps and tostring(details.fps) or ""
+  return "~1|" .. tostring(os.time()) .. "|" .. tostring(EV[event] or clean(event)) .. "|" ..
+    tostring(SV[severity] or clean(severity)) .. "|" .. clean(code) .. "|" .. fps .. "|" ..
+    clean(details.msg or details.during) .. "|" .. (ri and (tostring(ri) .. "@" .. RULES_VERSION) or "")
+end
+
+local function write_status(event, code, severity, details)
+  local line
+  local ri = classify(event, code, severity or "INFO", details and details.msg)
+  if STATUS_FORMAT == "compact" then
+    line = cencode(event, code, severity or "INFO", details, ri)
+  else
+    line = jencode({
+      t = os.time(),
+      user = username,
+      uid = userid,
+      event = event,
+      code = code or "",
+      severity = severity or "INFO",
+      details = details or {},
+      ri = ri,
+      rv = ri and RULES_VERSION or nil,
+      action = ri and ((RULES[ri + 1] and RULES[ri + 1].action) or DEFAULT_ACTION) or nil
+    })
+  end
+  if line then
+    pcall(function()
+      -- the monitor rotates by renaming the log; start the new segment if it is gone
+      if isfile and not isfile(logfile) then
+        writefile(logfile, line .. "\n")
+      else
+        appendfile(logfile, line .. "\n")
+      end
+    end)
+  end
+end
+
+-- rotation signal from the monitor: ack it and open the new segment with a record
+local function check_rotate()
+  local ok, pending = pcall(function() return isfile and isfile(rotatefile) end)
+  if ok and pending then
+    pcall(function() delfile(rotatefile) end)
+    write_status("RUNNING", "SEGMENT", "INFO", {})
+  end
+end
+
+-- heartbeat: RUNNING every 20s
+task.spawn(function()
+  while task.wait(20) do
+    check_rotate()
+    local fps = 0
+    pcall(function() fps = math.floor(workspace:GetRealPhysicsFPS() or 0) end)
+    write_status("RUNNING", "OK", "INFO", {fps = fps})
+  end
+end)
+
+-- Teleport events
+pcall(function()
+  TeleportService.TeleportInitFailed:Connect(function(placeId, reason)
+    write_status("ERROR", tostring(reason), "MINOR", {during = "teleport"})
+  end)
+  TeleportService.TeleportStart:Connect(function()
+    write_status("TELEPORT_BEGIN", "", "INFO", {})
+  end)
+  TeleportService.TeleportStateChanged:Connect(function(state)
+    write_status("TELEPORT_END", tostring(state), "INFO", {})
+  end)
+end)
+
+-- CoreGui error prompts: rules with msg + code turn the prompt text into that code, else minor
+pcall(function()
+  CoreGui.ChildAdded:Connect(function(child)
+    local txt = ""
+    pcall(function()
+      if child and child.FindFirstChild then
+        local e = child:FindFirstChild("ErrorMessage") or child:FindFirstChild("Message")
+        if e and e.Text then txt = e.Text end
+      end
+    end)
+    if txt ~= "" then
+      local lower = string.lower(tostring(txt))
+      for _, r in ipairs(RULES) do
+        if r.prompt and rule_msg(lower, r.prompt) then
+          write_status(r.emit_event, r.code, r.emit_severity, {msg = txt})
+          return
+        end
+      end
+      write_status("ERROR", "GUI_ERROR", "MINOR", {msg = txt})
+    end
+  end)
+end)
+
+-- Player removed => likely kick
+pcall(function()
+  if player then
+    player.AncestryChanged:Connect(function(_, parent)
+      if parent == nil then
+        write_status("KICK", "PLAYER_REMOVED", "SEVERE", {})
+      end
+    end)
+  end
+end)
+
+-- BindToClose -> Crash / Shutdown
+pcall(function()
+  game:BindToClose(function()
+    write_status("CRASH", "BIND_CLOSE", "SEVERE", {})
+  end)
+end)
+
+-- Heartbeat stale detection (if main thread stops)
+local last = tick()
+RunService.Heartbeat:Connect(function() last = tick() end)
+task.spawn(function()
+  while task.wait(60) do
+    if tick() - last > 120 then
+      write_status("ERROR", "HEARTBEAT_STALE", "SEVERE", {})
+    end
+  end
+end)
+
+-- initial record
+write_status("RUNNING", "INIT_OK", "INFO", {})
+'''
+
+# --- Status record formats (JSON or compact, detected per line) ---
+STATUS_EVENTS = ("RUNNING", "ERROR", "KICK", "CRASH", "DISCONNECT", "TELEPORT_BEGIN", "TELEPORT_END")
+STATUS_SEVERITIES = ("INFO", "MINOR", "SEVERE")
+_EVENT_IDS = {e: i for i, e in enumerate(STATUS_EVENTS)}
+_SEVERITY_IDS = {s: i for i, s in enumerate(STATUS_SEVERITIES)}
+COMPACT_PREFIX = "~1|"
+
+def _compact_enum(v, names):
+    if v.isdigit():
+        i = int(v)
+        if i < len(names):
+            return names[i]
+    return v
+
+def parse_status_line(ln):
+    # compact: ~1|t|event|severity|code|fps|msg[|ri@rv] ; anything starting with "{" is JSON
+    if ln.startswith(COMPACT_PREFIX):
+        parts = ln.split("|", 7)
+        if len(parts) not in (7, 8):
+            return None
+        _, t, ev, sv, code, fps, msg = parts[:7]
+        try:
+            t = int(t)
+        except ValueError:
+            return None
+        details = {}
+        if fps:
+            try:
+                details["fps"] = int(fps)
+            except ValueError:
+                pass
+        if msg:
+            details["msg"] = msg
+        rec = {"t": t, "event": _compact_enum(ev, STATUS_EVENTS), "code": code,
+               "severity": _compact_enum(sv, STATUS_SEVERITIES), "details": details}
+        if len(parts) == 8 and "@" in parts[7]:
+            ri, rec["rv"] = parts[7].split("@", 1)
+            try:
+                rec["ri"] = int(ri)
+            except ValueError:
+                rec.pop("rv")
+        return rec
+    try:
+        rec = json.loads(ln)
+    except Exception:
+        return None
+    return rec if isinstance(rec, dict) else None
+
+def format_status_line(fmt, t, event, code="", severity="INFO", details=None, uid=0, user="", verdict=None):
+    # python mirror of the lua encoders (benchmarks / simulation); verdict = (ri, rules version, action)
+    details = details or {}
+    if fmt == "compact":
+        clean = lambda v: re.sub(r"[|\r\n]", " ", str(v if v is not None else ""))
+        fps = details.get("fps")
+        return (f"{COMPACT_PREFIX}{int(t)}|{_EVENT_IDS.get(event, clean(event))}|"
+                f"{_SEVERITY_IDS.get(severity, clean(severity))}|{clean(code)}|"
+                f"{'' if fps is None else fps}|{clean(details.get('msg') or details.get('during') or '')}"
+                + (f"|{verdict[0]}@{verdict[1]}" if verdict else ""))
+    rec = {"t": int(t), "user": user, "uid": uid, "event": event, "code": code,
+           "severity": severity, "details": details}
+    if verdict:
+        rec.update(ri=verdict[0], rv=verdict[1], action=verdict[2])
+    return json.dumps(rec, separators=(",", ":"))
+
+# --- Severity rules (rules.json): compiled once, matched on the client and re-checked by the monitor ---
+RULE_ACTIONS = ("rejoin", "rejoin_delayed", "ignore", "alert")
+DEFAULT_RULE_DELAY = 60      # seconds added by rejoin_delayed when the rule has no "delay"
+RULE_CACHE_MAX = 4096        # (event, severity, code) -> verdict entries before the cache is reset
+
+# first match wins. msg + code: GUI prompts containing msg are written as that code (client side);
+# msg without code: matched against the record message. code is a prefix, code_has a substring,
+# code_re a full regex (code_re rules are left to the monitor; lua patterns cannot express them).
+DEFAULT_RULES = {
+    "default_action": "ignore",
+    "rules": [
+        {"name": "kick_prompt", "msg": ["kick", "lost connection", "disconnected"], "code": "KICK_OR_DISCONNECT",
+         "severity": ["SEVERE"], "action": "rejoin"},
+        {"name": "error_277", "msg": ["277"], "code": "ERROR_277", "action": "rejoin"},
+        {"name": "error_268", "msg": ["268"], "code": "ERROR_268", "action": "rejoin"},
+        {"name": "player_removed", "code_has": "PLAYER_REMOVED", "action": "rejoin"},
+        {"name": "heartbeat_stale", "code_has": "HEARTBEAT_STALE", "action": "rejoin"},
+        {"name": "kick_crash_disconnect", "event": ["KICK", "CRASH", "DISCONNECT"], "action": "rejoin"},
+        {"name": "severe", "severity": ["SEVERE"], "action": "rejoin"},
+    ],
+}
+
+def _rule_list(v, name, field):
+    if v is None:
+        return None
+    if isinstance(v, str):
+        v = [v]
+    if not isinstance(v, list) or not v or not all(isinstance(x, str) and x for x in v):
+        raise ValueError(f"rule {name!r}: {field} must be a non-empty string or list of strings")
+    return v
+
+def _lua_str(s):
+    out = []
+    for ch in str(s):
+        if ch in '"\\':
+            out.append("\\" + ch)
+        elif ord(ch) < 32 or ord(ch) == 127:
+            out.append(f"\\{ord(ch):03d}")
+        else:
+            out.append(ch)
+    return '"' + "".join(out) + '"'
+
+class RuleSet:
+    def __init__(self, data):
+        if not isinstance(data, dict) or not isinstance(data.get("rules", []), list):
+            raise ValueError('expected {"default_action": ..., "rules": [...]}')
+        default = data.get("default_action", "ignore")
+        if default not in RULE_ACTIONS:
+            raise ValueError(f"unknown default_action {default!r}")
+        self.rules = []
+        for i, r in enumerate(data.get("rules", [])):
+            if not isinstance(r, dict):
+                raise ValueError(f"rule #{i} is not an object")
+            name = str(r.get("name") or f"rule{i}")
+            action = r.get("action", "rejoin")
+            if action not in RULE_ACTIONS:
+                raise ValueError(f"rule {name!r}: unknown action {action!r} (one of {', '.join(RULE_ACTIONS)})")
+            code, code_has, code_re = r.get("code"), r.get("code_has"), r.get("code_re")
+            for key, v in (("code", code), ("code_has", code_has)):
+                if v is not None and (not isinstance(v, str) or not v):
+                    raise ValueError(f"rule {name!r}: {key} must be a non-empty string")
+            if sum(v is not None for v in (code, code_has, code_re)) > 1:
+                raise ValueError(f"rule {name!r}: use one of code, code_has, code_re")
+            if code_re is not None:
+                try:
+                    re.compile(code_re)
+                except (re.error, TypeError) as e:
+                    raise ValueError(f"rule {name!r}: bad code_re: {e}")
+            try:
+                delay = float(r.get("delay", DEFAULT_RULE_DELAY if action == "rejoin_delayed" else 0))
+            except (TypeError, ValueError):
+                raise ValueError(f"rule {name!r}: delay must be a number")
+            events = _rule_list(r.get("event"), name, "event")
+            sevs = _rule_list(r.get("severity"), name, "severity")
+            msg = _rule_list(r.get("msg"), name, "msg")
+            self.rules.append({
+                "idx": i, "name": name, "action": action, "delay": max(0.0, delay),
+                "event": [e.upper() for e in events] if events else None,
+                "severity": [s.upper() for s in sevs] if sevs else None,
+                "code": code.upper() if code else None, "code_has": code_has.upper() if code_has else None,
+                "code_re": code_re,
+                "msg": [m.lower() for m in msg] if msg else None,
+            })
+        self.default = {"idx": -1, "name": "default", "action": default, "delay": 0.0}
+        self.verdicts = self.rules + [self.default]   # verdicts[-1] is the default, as ri == -1 on the wire
+        # one alternation, tried in rule order: the first alternative that matches is the first matching rule
+        try:
+            self.regex = re.compile("|".join(f"(?P<r{r['idx']}>{self._pattern(r)})" for r in self.rules),
+                                    re.I | re.S) if self.rules else None
+        except re.error as e:
+            raise ValueError(f"rules do not compile: {e}")
+        self.msg_rules = any(r["msg"] and not self._matches_code(r) for r in self.rules)
+        canon = json.dumps([{k: v for k, v in r.items() if k != "idx"} for r in self.verdicts], sort_keys=True)
+        self.version = hashlib.sha1(canon.encode("utf-8")).hexdigest()[:8]
+        self.cache = {}
+
+    @staticmethod
+    def _matches_code(r):
+        return bool(r["code"] or r["code_has"] or r["code_re"])
+
+    @staticmethod
+    def _pattern(r):
+        # matched against "EVENT\x1fSEVERITY\x1fCODE\x1fmsg"
+        field = lambda vals: "(?:" + "|".join(re.escape(v) for v in vals) + ")" if vals else "[^\x1f]*"
+        if r["code_re"]:
+            code = f"(?:{r['code_re']})"
+        elif r["code"]:
+            code = re.escape(r["code"]) + "[^\x1f]*"
+        elif r["code_has"]:
+            code = "[^\x1f]*" + re.escape(r["code_has"]) + "[^\x1f]*"
+        else:
+            code = "[^\x1f]*"
+        pat = field(r["event"]) + "\x1f" + field(r["severity"]) + "\x1f" + code + "\x1f"
+        if r["msg"] and not RuleSet._matches_code(r):
+            pat += ".*?" + field(r["msg"])
+        return pat
+
+    def _match(self, event, sev, code, msg):
+        m = self.regex.match(f"{event}\x1f{sev}\x1f{code}\x1f{msg}") if self.regex else None
+        return self.verdicts[int(m.lastgroup[1:])] if m else self.default
+
+    def classify(self, rec):
+        # -> verdict dict; a record the client already matched against this rule version is taken as is
+        if rec.get("rv") == self.version:
+            ri = rec.get("ri")
+            if type(ri) is int and -1 <= ri < len(self.rules):
+                return self.verdicts[ri]
+        event, sev, code = str(rec.get("event") or ""), str(rec.get("severity") or ""), str(rec.get("code") or "")
+        d = rec.get("details")
+        msg = d.get("msg") if isinstance(d, dict) else None
+        if msg and self.msg_rules:
+            return self._match(event, sev, code, str(msg))
+        key = (event, sev, code)
+        v = self.cache.get(key)
+        if v is None:
+            if len(self.cache) >= RULE_CACHE_MAX:
+                self.cache.clear()
+            v = self.cache[key] = self._match(event, sev, code, "")
+        return v
+
+    def to_lua(self):
+        # RULES table for the autoexec; code_re rules cannot be expressed as lua patterns -> opaque
+        rows = []
+        for r in self.rules:
+            f = []
+            if r["code_re"]:
+                f.append("opaque=true")
+            for key in ("event", "severity"):
+                if r[key]:
+                    f.append(f"{key}={{" + ", ".join(f"[{_lua_str(v)}]=true" for v in r[key]) + "}")
+            if r["code"]:
+                f.append(f"code={_lua_str(r['code'])}")
+            if r["code_has"]:
+                f.append(f"code_has={_lua_str(r['code_has'])}")
+            if r["msg"] and r["code"]:
+                f.append("prompt={" + ", ".join(_lua_str(m) for m in r["msg"]) + "}")
+                f.append(f"emit_event={_lua_str(r['event'][0] if r['event'] else 'ERROR')}")
+                f.append(f"emit_severity={_lua_str(r['severity'][0] if r['severity'] else 'SEVERE')}")
+            elif r["msg"] and not self._matches_code(r):
+                f.append("msg={" + ", ".join(_lua_str(m) for m in r["msg"]) + "}")
+            f.append(f"action={_lua_str(r['action'])}")
+            rows.append("  {" + ", ".join(f) + "},")
+        return "{\n" + "\n".join(rows) + "\n}"
+
+def load_rules():
+    # first run writes the defaults so they can be edited. a file that does not parse is left as
+    # is: the last good copy is used, or the defaults if there is none yet
+    data = RULES_STORE.get()
+    if RULES_STORE.error and not data:
+        print(f"[!] {RULES_FILE}: {RULES_STORE.error}; using built-in rules")
+        return RuleSet(DEFAULT_RULES)
+    if not data and not os.path.exists(RULES_FILE):
+        RULES_STORE.save(DEFAULT_RULES)
+        data = DEFAULT_RULES
+    try:
+        return RuleSet(data)
+    except ValueError as e:
+        print(f"[!] {RULES_FILE}: {e}; using built-in rules")
+        return RuleSet(DEFAULT_RULES)
+
+def render_lua(cfg, rules=None):
+    fmt = "compact" if cfg.get("status_format", DEFAULT_CONFIG["status_format"]) == "compact" else "json"
+    rules = rules or load_rules()
+    return (LUA_SCRIPT.replace("__STATUS_FORMAT__", fmt).replace("__RULES_VERSION__", rules.version)
+            .replace("__DEFAULT_ACTION__", rules.default["action"]).replace("__RULES__", rules.to_lua()))
+
+def install_lua(autoexec_dirs=None, cfg=None, rules=None):
+    if autoexec_dirs is None:
+        autoexec_dirs = AUTOEXEC_DIRS
+    cfg = cfg or load_config()
+    script = render_lua(cfg, rules)
+    written = []
+    for d in autoexec_dirs:
+        try:
+            ensure_dir(d)
+            target = os.path.join(d, LUA_FILENAME)
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(script)
+            written.append(target)
+        except Exception as e:
+            print("[!] Failed write lua to", d, ":", e)
+    # ensure report dir exists in executor workspace(s)
+    exec_ws = cfg.get("exec_workspace", DEFAULT_EXEC_WS)
+    # if exec_ws is list -> create for each; else create single
+    if isinstance(exec_ws, (list, tuple)):
+        for ws in exec_ws:
+            ensure_dir(os.path.join(ws, REPORT_DIRNAME))
+    else:
+        ensure_dir(os.path.join(exec_ws, REPORT_DIRNAME))
+    return written
+
+# --- Process table snapshot (one scan shared by every caller) ---
+PROC_SNAPSHOT_TTL = 2.0   # seconds a snapshot is reused
+PROC_WAIT_TICK = 0.5      # launch waiters share one scan per tick, however many are in flight
+_proc_lock = threading.Lock()
+_proc_cache = {"t": 0.0, "index": {}}
+try:
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except Exception:
+    _CLK_TCK, _PAGE_SIZE = 100, 4096
+
+def _proc_pkg_name(argv0):
+    # Android app processes are named "<pkg>" or "<pkg>:<subprocess>"
+    return argv0.rsplit("/", 1)[-1].split(":", 1)[0]
+
+def _index_add(index, name, pid, rss, cpu):
+    ent = index.get(name)
+    if ent is None:
+        ent = index[name] = {"pids": [], "rss": 0, "cpu": 0.0}
+    ent["pids"].append(pid)
+    ent["rss"] += rss
+    ent["cpu"] += cpu
+
+def _scan_proc():
+    index = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/cmdline", "rb") as f:
+                raw = f.read(512)
+            if not raw:
+                continue   # kernel thread
+            with open(f"/proc/{name}/stat", "rb") as f:
+                st = f.read()
+        except OSError:
+            continue
+        # fields after "(comm)": state ppid ... utime(14) stime(15) ... rss(24)
+        fields = st[st.rfind(b")") + 2:].split()
+        try:
+            cpu = (int(fields[11]) + int(fields[12])) / _CLK_TCK
+            rss = int(fields[21]) * _PAGE_SIZE
+        except (IndexError, ValueError):
+            cpu, rss = 0.0, 0
+        argv0 = raw.split(b"\0", 1)[0].decode("utf-8", "ignore")
+        _index_add(index, _proc_pkg_name(argv0), int(name), rss, cpu)
+    return index
+
+def _scan_psutil(psutil):
+    index = {}
+    for p in psutil.process_iter(["pid", "cmdline", "memory_info", "cpu_times"]):
+        info = p.info
+        cmd = info.get("cmdline") or []
+        if not cmd:
+            continue
+        mi, ct = info.get("memory_info"), info.get("cpu_times")
+        _index_add(index, _proc_pkg_name(cmd[0]), info["pid"],
+                   mi.rss if mi else 0, (ct.user + ct.system) if ct else 0.0)
+    return index
+
+def _scan_ps():
+    # /proc hidden from us (hidepid): a single ps listing instead of one per account
+    index = {}
+    for ln in shout("ps -A -o PID,RSS,NAME").splitlines()[1:]:
+        parts = ln.split(None, 2)
+        if len(parts) == 3 and parts[0].isdigit():
+            rss = int(parts[1]) * 1024 if parts[1].isdigit() else 0
+            _index_add(index, _proc_pkg_name(parts[2].strip()), int(parts[0]), rss, 0.0)
+    return index
+
+def _scan_processes():
+    try:
+        psutil = optional_import("psutil")
+        if psutil is not None:
+            return _scan_psutil(psutil)
+        if os.path.exists("/proc/1"):
+            return _scan_proc()
+    except Exception as e:
+        print("[!] process scan error:", e)
+    return _scan_ps()
+
+def process_snapshot(max_age=PROC_SNAPSHOT_TTL):
+    # pkg -> {"pids": [...], "rss": bytes, "cpu": cpu seconds}; exact package match
+    with _proc_lock:
+        if time.time() - _proc_cache["t"] <= max_age:
+            return _proc_cache["index"]
+        index = _scan_processes()
+        _proc_cache["t"] = time.time()
+        _proc_cache["index"] = index
+        return index
+
+def last_process_snapshot():
+    # the most recent snapshot, however old; never scans and never waits on a scan in progress
+    return _proc_cache["index"]
+
+# --- Helper: count roblox processes (best-effort) ---
+def count_roblox_processes_and_list(pkg_prefix=None):
+    accounts = load_accounts()
+    running = []
+    stopped = []
+    snap = process_snapshot()
+    for uid, info in accounts.items():
+        pkg = info.get("pkg")
+        if not pkg:
+            stopped.append(f"{uid} ({info.get('username','')}) - no pkg")
+            continue
+        if snap.get(pkg):
+            running.append(f"{uid} ({info.get('username','')}) - {pkg}")
+        else:
+            stopped.append(f"{uid} ({info.get('username','')}) - {pkg}")
+    return running, stopped
+
+# --- Per-instance telemetry (incremental sampler, no blocking interval) ---
+class InstanceSampler:
+    def __init__(self):
+        self.prev = {}   # pid -> (starttime, cpu jiffies, monotonic ts)
+        self.lock = threading.Lock()
+
+    def _read_pid(self, pid):
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                st = f.read()
+        except OSError:
+            return None
+        fields = st[st.rfind(b")") + 2:].split()
+        try:
+            jiffies = int(fields[11]) + int(fields[12])
+            threads = int(fields[17])
+            start = int(fields[19])
+            rss = int(fields[21]) * _PAGE_SIZE
+        except (IndexError, ValueError):
+            return None
+        pss = None
+        try:
+            with open(f"/proc/{pid}/smaps_rollup", "rb") as f:
+                for ln in f:
+                    if ln.startswith(b"Pss:"):
+                        pss = int(ln.split()[1]) * 1024
+                        break
+        except (OSError, ValueError, IndexError):
+            pass
+        return jiffies, threads, start, rss, pss
+
+    def sample(self, accounts, snap=None):
+        # uid -> {pkg, pids, rss, pss, cpu (% of one core since last sample), threads, uptime}
+        snap = snap if snap is not None else process_snapshot()
+        now = time.monotonic()
+        try:
+            with open("/proc/uptime") as f:
+                boot_up = float(f.read().split()[0])
+        except Exception:
+            boot_up = None
+        out = {}
+        with self.lock:
+            seen = set()
+            for uid, info in accounts.items():
+                ent = snap.get(info.get("pkg") or "")
+                if not ent:
+                    continue
+                rec = {"pkg": info.get("pkg"), "pids": len(ent["pids"]), "rss": 0, "pss": None,
+                       "cpu": None, "threads": 0, "uptime": None}
+                for pid in ent["pids"]:
+                    d = self._read_pid(pid)
+                    if d is None:
+                        continue
+                    jiffies, threads, start, rss, pss = d
+                    seen.add(pid)
+                    rec["rss"] += rss
+                    rec["threads"] += threads
+                    if pss is not None:
+                        rec["pss"] = (rec["pss"] or 0) + pss
+                    prev = self.prev.get(pid)
+                    self.prev[pid] = (start, jiffies, now)
+                    if prev and prev[0] == start and now > prev[2]:
+                        pct = (jiffies - prev[1]) / _CLK_TCK / (now - prev[2]) * 100.0
+                        rec["cpu"] = round((rec["cpu"] or 0.0) + pct, 1)
+                    if boot_up is not None:
+                        up = boot_up - start / _CLK_TCK
+                        rec["uptime"] = max(rec["uptime"] or 0, int(up))
+                if not rec["threads"]:
+                    rec["rss"] = ent["rss"]   # /proc/<pid> unreadable: fall back to snapshot numbers
+                out[uid] = rec
+            for pid in list(self.prev):
+                if pid not in seen:
+                    del self.prev[pid]
+        return out
+
+_instance_sampler = InstanceSampler()
+
+def record_telemetry(samples):
+    # append one line per report; keep a single rotated segment
+    try:
+        ensure_dir(os.path.dirname(TELEMETRY_FILE))
+        if os.path.exists(TELEMETRY_FILE) and os.path.getsize(TELEMETRY_FILE) > TELEMETRY_MAX_BYTES:
+            os.replace(TELEMETRY_FILE, TELEMETRY_FILE + ".1")
+        with open(TELEMETRY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"t": int(time.time()), "instances": samples}, separators=(",", ":")) + "\n")
+    except Exception as e:
+        print("[!] telemetry write error:", e)
+
+def _fmt_mb(b):
+    return "?" if b is None else f"{b / (1024**2):.0f}MB"
+
+def _fmt_secs(s):
+    if s is None:
+        return "?"
+    h, rem = divmod(int(s), 3600)
+    return f"{h}:{rem // 60:02d}:{rem % 60:02d}"
+
+def format_instance_lines(samples):
+    lines = []
+    for uid, r in samples.items():
+        cpu = "n/a" if r["cpu"] is None else f"{r['cpu']}%"
+        lines.append(f"{uid} — RSS {_fmt_mb(r['rss'])} PSS {_fmt_mb(r['pss'])} CPU {cpu} "
+                     f"thr {r['threads']} up {_fmt_secs(r['uptime'])}")
+    return "\n".join(lines)
+
+# --- Screenshot helper ---
+def capture_screenshot(cfg):
+    path = cfg.get("screenshot_path", DEFAULT_CONFIG["screenshot_path"])
+    ensure_dir(os.path.dirname(path))
+    # try adb first (requires adb host), else try local screencap (on device)
+    try:
+        code = sh(f"adb exec-out screencap -p > '{path}'")
+        if code == 0 and os.path.exists(path):
+            return path
+    except Exception:
+        pass
+    # fallback: local screencap
+    try:
+        code = sh(f"screencap -p '{path}'")
+        if code == 0 and os.path.exists(path):
+            return path
+    except Exception:
+        pass
+    return None
+
+
+# --- Streaming screenshot: raw screencap over a pipe, downscale + encode in memory ---
+_SCREENCAP_MODES = {1: ("RGBA", "RGBA", 4), 2: ("RGBX", "RGBX", 4), 5: ("RGBA", "BGRA", 4), 4: ("RGB", "BGR;16", 2)}
+_last_frame = {"hash": None}
+
+def _screencap_raw():
+    # same order as capture_screenshot: adb host first, then on-device screencap; no temp file
+    for cmd in (["adb", "exec-out", "screencap"], ["screencap"]):
+        try:
+            p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=15)
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if p.returncode == 0 and len(p.stdout) > 16:
+            return p.stdout
+    return None
+
+def _decode_screencap(raw):
+    w, h, fmt = struct.unpack_from("<III", raw)
+    mode, rawmode, bpp = _SCREENCAP_MODES.get(fmt, ("RGBA", "RGBA", 4))
+    header = len(raw) - w * h * bpp
+    if w <= 0 or h <= 0 or header not in (12, 16):
+        return None
+    img = optional_import("PIL.Image").frombuffer(mode, (w, h), memoryview(raw)[header:], "raw", rawmode, 0, 1)
+    return img.convert("RGB")
+
+def _frame_hash(img):
+    # coarse grayscale thumbnail, 4-bit quantized: ignores noise, catches dialogs/scene changes
+    thumb = img.convert("L").resize((64, max(1, 64 * img.height // img.width)))
+    return hashlib.blake2b(bytes(b >> 4 for b in thumb.tobytes()), digest_size=16).hexdigest()
+
+def capture_screenshot_stream(cfg):
+    # returns (data, filename, mime), ("unchanged", None, None) or None on failure
+    Image = optional_import("PIL.Image")
+    if Image is None:
+        return None
+    raw = _screencap_raw()
+    if not raw:
+        return None
+    try:
+        img = _decode_screencap(raw)
+        if img is None:
+            return None
+        del raw
+        max_w = int(cfg.get("screenshot_max_width", DEFAULT_CONFIG["screenshot_max_width"]) or 0)
+        if max_w and img.width > max_w:
+            img.thumbnail((max_w, img.height), Image.BILINEAR)
+        h = _frame_hash(img)
+        if cfg.get("screenshot_skip_unchanged", True) and h == _last_frame["hash"]:
+            return "unchanged", None, None
+        fmt = str(cfg.get("screenshot_format", DEFAULT_CONFIG["screenshot_format"])).lower()
+        fmt = "webp" if fmt == "webp" else "jpeg"
+        buf = io.BytesIO()
+        img.save(buf, fmt.upper(), quality=int(cfg.get("screenshot_quality", DEFAULT_CONFIG["screenshot_quality"])))
+        _last_frame["hash"] = h
+        ext = "jpg" if fmt == "jpeg" else fmt
+        return buf.getvalue(), f"screenshot.{ext}", f"image/{fmt}"
+    except Exception as e:
+        print("[!] Stream screenshot error:", e)
+        return None
+
+def capture_screenshot_bytes(cfg):
+    # stream mode when possible, legacy PNG file otherwise
+    if cfg.get("screenshot_mode", DEFAULT_CONFIG["screenshot_mode"]) == "stream" and optional_import("PIL.Image") is not None:
+        res = capture_screenshot_stream(cfg)
+        if res is not None:
+            return res
+    sc_path = capture_screenshot(cfg)
+    if sc_path and os.path.exists(sc_path):
+        try:
+            with open(sc_path, "rb") as f:
+                return f.read(), "screenshot.png", "image/png"
+        except Exception as e:
+            print("[!] Failed attach screenshot:", e)
+    return None
+
+# --- Webhook delivery: persistent outbox + one sender thread ---
+class WebhookDelivery:
+    MAX_EMBEDS = 10       # Discord limit per message (also caps files per message)
+    MAX_EMBED_CHARS = 6000   # Discord limit on the summed embed text per message
+    MAX_PENDING = 200     # older entries beyond this go to outbox/dead
+    MAX_BACKOFF = 300
+
+    def __init__(self, outbox=None):
+        self.outbox = outbox or OUTBOX_DIR
+        self.dead = os.path.join(self.outbox, "dead")
+        self.cv = threading.Condition()
+        self.session = None
+        self.thread = None
+        self.blocked_until = 0.0   # rate limit / backoff gate
+        self.failures = 0
+        self.seq = 0
+        self.unmerged = set()      # ids from a rejected merge, retried one message each
+
+    def _entries(self):
+        try:
+            return sorted(n[:-5] for n in os.listdir(self.outbox) if n.endswith(".json"))
+        except OSError:
+            return []
+
+    def pending(self):
+        return len(self._entries())
+
+    def enqueue(self, url, payload, kind="status", attachment=None, filename=None, mime="image/png"):
+        with self.cv:
+            self.seq += 1
+            mid = f"{time.time_ns()}-{self.seq:04d}-{kind}"
+            entry = {"url": url, "kind": kind, "payload": payload, "t": time.time()}
+            if attachment:
+                write_atomic(os.path.join(self.outbox, mid + ".att"), attachment)
+                entry["file"] = {"name": filename or "attachment.bin", "mime": mime}
+            write_atomic(os.path.join(self.outbox, mid + ".json"),
+                         json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+            self._trim()
+            self.cv.notify_all()
+        self.start()
+        return mid
+
+    def start(self):
+        with self.cv:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._loop, name="webhook-sender", daemon=True)
+                self.thread.start()
+
+    def flush(self, timeout=30):
+        # wait until the outbox drains (used by one-shot/manual reports)
+        end = time.time() + timeout
+        while time.time() < end:
+            if not self._entries():
+                return True
+            time.sleep(0.2)
+        return not self._entries()
+
+    def _trim(self):
+        ids = self._entries()
+        for mid in ids[:max(0, len(ids) - self.MAX_PENDING)]:
+            print(f"[!] Webhook outbox full, moving {mid} to {self.dead}")
+            self._move_dead(mid)
+
+    def _load(self, mid):
+        try:
+            with open(os.path.join(self.outbox, mid + ".json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _remove(self, mid):
+        self.unmerged.discard(mid)
+        for ext in (".json", ".att"):
+            try:
+                os.remove(os.path.join(self.outbox, mid + ext))
+            except OSError:
+                pass
+
+    def _move_dead(self, mid):
+        self.unmerged.discard(mid)
+        ensure_dir(self.dead)
+        for ext in (".json", ".att"):
+            src = os.path.join(self.outbox, mid + ext)
+            if os.path.exists(src):
+                try:
+                    os.replace(src, os.path.join(self.dead, mid + ext))
+                except OSError:
+                    pass
+
+    def _next_batch(self):
+        # oldest entry; pending status snapshots for the same URL are merged into one message
+        ids = self._entries()
+        if not ids:
+            return []
+        first = self._load(ids[0])
+        if first is None:
+            self._move_dead(ids[0])
+            return []
+        batch = [(ids[0], first)]
+        if first.get("kind") == "status" and ids[0] not in self.unmerged:
+            n, size = self._embed_size(first)
+            for mid in ids[1:]:
+                e = self._load(mid)
+                if not (e and e.get("kind") == "status" and e.get("url") == first.get("url")):
+                    continue
+                en, es = self._embed_size(e)
+                if n + en > self.MAX_EMBEDS or size + es > self.MAX_EMBED_CHARS:
+                    break
+                batch.append((mid, e))
+                n, size = n + en, size + es
+        return batch
+
+    @staticmethod
+    def _embed_size(entry):
+        # (embeds, characters Discord counts against MAX_EMBED_CHARS)
+        embeds = entry.get("payload", {}).get("embeds") or []
+        size = 0
+        for em in embeds:
+            size += len(str(em.get("title", ""))) + len(str(em.get("description", "")))
+            size += len(str((em.get("footer") or {}).get("text", ""))) + len(str((em.get("author") or {}).get("name", "")))
+            for fl in em.get("fields") or []:
+                size += len(str(fl.get("name", ""))) + len(str(fl.get("value", "")))
+        return len(embeds), size
+
+    def _session(self):
+        if self.session is None:
+            self.session = optional_import("requests").Session()   # keep-alive across reports
+        return self.session
+
+    def _backoff(self, why):
+        self.failures += 1
+        delay = min(self.MAX_BACKOFF, 2 ** self.failures) * random.uniform(0.5, 1.0)
+        self.blocked_until = time.time() + delay
+        print(f"[!] Webhook {why}; retry in {delay:.0f}s")
+
+    def _rate_limit(self, res):
+        # honour Discord's bucket headers so the next send does not hit 429
+        h = res.headers
+        if h.get("X-RateLimit-Remaining") == "0":
+            try:
+                self.blocked_until = max(self.blocked_until, time.time() + float(h.get("X-RateLimit-Reset-After", "1")))
+            except ValueError:
+                pass
+
+    def _send(self, batch):
+        url = batch[0][1]["url"]
+        payload = dict(batch[-1][1]["payload"])
+        if len(batch) > 1:
+            payload["embeds"] = [em for _mid, e in batch for em in e["payload"].get("embeds", [])][-self.MAX_EMBEDS:]
+            print(f"[Webhook] Merging {len(batch)} pending status reports into one message")
+        files = {}
+        for mid, e in batch:
+            fmeta = e.get("file")
+            if fmeta:
+                try:
+                    with open(os.path.join(self.outbox, mid + ".att"), "rb") as f:
+                        files[f"files[{len(files)}]"] = (fmeta["name"], f.read(), fmeta.get("mime", "application/octet-stream"))
+                except OSError:
+                    pass
+        try:
+            if files:
+                res = self._session().post(url, data={"payload_json": json.dumps(payload)}, files=files, timeout=15)
+            else:
+                res = self._session().post(url, json=payload, timeout=15)
+        except Exception as e:
+            self.session = None
+            self._backoff(f"send error: {e}")
+            return
+        code = getattr(res, "status_code", 0)
+        print("[Webhook] HTTP", code)
+        if 200 <= code < 300:
+            self.failures = 0
+            for mid, _e in batch:
+                self._remove(mid)
+            self._rate_limit(res)
+        elif code == 429:
+            retry = res.headers.get("Retry-After")
+            try:
+                retry = float(retry) if retry is not None else float(res.json().get("retry_after", 1))
+            except Exception:
+                retry = 5.0
+            self.blocked_until = time.time() + max(0.5, retry)
+            print(f"[i] Webhook rate limited, waiting {retry:.1f}s")
+        elif code >= 500 or code == 408:
+            self._backoff(f"HTTP {code}")
+        elif len(batch) > 1:
+            # the merge itself may be what was rejected: send each report on its own before
+            # dead-lettering any of them
+            print(f"[!] Webhook rejected a merge of {len(batch)} (HTTP {code}); retrying them one by one")
+            self.unmerged.update(mid for mid, _e in batch)
+        else:
+            # permanent rejection (bad URL/payload): keep it for inspection, don't retry forever
+            print(f"[!] Webhook rejected (HTTP {code}); moved to {self.dead}")
+            for mid, _e in batch:
+                self._move_dead(mid)
+
+    def _loop(self):
+        while True:
+            with self.cv:
+                wait = self.blocked_until - time.time()
+                if wait > 0:
+                    self.cv.wait(min(wait, 5.0))
+                    continue
+            if optional_import("requests") is None:
+                return
+            batch = self._next_batch()
+            if not batch:
+                with self.cv:
+                    if not self._entries():
+                        self.cv.wait(30.0)
+                continue
+            self._send(batch)
+
+_delivery = None
+_delivery_lock = threading.Lock()
+
+def get_delivery():
+    global _delivery
+    with _delivery_lock:
+        if _delivery is None:
+            _delivery = WebhookDelivery()
+        return _delivery
+
+def send_alert_webhook(title, text, cfg=None, color=0xe67e22):
+    cfg = cfg or load_config()
+    url = cfg.get("webhook_url", "").strip()
+    if not url or optional_import("requests") is None:
+        return False
+    icon = cfg.get("icon_url", DEFAULT_CONFIG["icon_url"])
+    embed = {
+        "title": title,
+        "description": f"**{cfg.get('device_name', 'GPT-Tool Device')}**: {text}"[:4000],
+        "color": color,
+        "footer": {"text": "Made with 💚 by GPT TOOL", "icon_url": icon},
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    get_delivery().enqueue(url, {"username": "GPT TOOL", "avatar_url": icon, "embeds": [embed]}, kind="alert")
+    return True
+
+def send_alert_async(title, text, cfg=None, color=0xe67e22):
+    # monitor threads must never block on, or die from, the webhook path
+    def run():
+        try:
+            send_alert_webhook(title, text, cfg, color)
+        except Exception as e:
+            print("[!] alert webhook error:", e)
+    threading.Thread(target=run, name="alert", daemon=True).start()
+
+# --- Webhook sender (full embed + optional screenshot) ---
+def send_status_webhook(cfg=None, monitor=None):
+    if optional_import("requests") is None:
+        print("[!] requests module missing; webhook disabled (pip install requests).")
+        return False
+    cfg = cfg or load_config()
+    url = cfg.get("webhook_url", "").strip()
+    if not url:
+        # not configured
+        return False
+    device = cfg.get("device_name", "GPT-Tool Device")
+    icon = cfg.get("icon_url", DEFAULT_CONFIG["icon_url"])
+    # sys info
+    uptime = str(datetime.now() - start_time).split('.')[0]
+    cpu = 0.0
+    mem_total_g = mem_used_g = mem_percent = 0.0
+    tool_mem_mb = 0.0
+    psutil = optional_import("psutil")
+    if psutil:
+        cpu = psutil.cpu_percent(interval=None)   # since previous call; never blocks
+        vm = psutil.virtual_memory()
+        mem_total_g = round(vm.total / (1024**3), 2)
+        mem_used_g = round(vm.used / (1024**3), 2)
+        mem_percent = vm.percent
+        proc = psutil.Process(os.getpid())
+        tool_mem_mb = round(proc.memory_info().rss / (1024**2), 2)
+    # roblox processes
+    running, stopped = count_roblox_processes_and_list(cfg.get("package_prefix"))
+    samples = _instance_sampler.sample(load_accounts())
+    record_telemetry(samples)
+    roblox_count = len(running)
+    status_text = f"🟢 {roblox_count} Roblox instance(s) running" if roblox_count > 0 else "🔴 All stopped"
+
+    # accounts details
+    accounts = load_accounts()
+    if accounts:
+        acc_lines = []
+        for uid, info in accounts.items():
+            acc_lines.append(f"{uid} ({info.get('username','')}) — {info.get('pkg','')} — game {info.get('gid','')}")
+        acc_text = "\n".join(acc_lines)
+    else:
+        acc_text = "None"
+
+    # build embed
+    fields = []
+    fields.append({"name":"📱 Device","value":device,"inline":False})
+    fields.append({"name":"💾 Total Memory","value":f"{mem_total_g} GB","inline":True})
+    fields.append({"name":"⏱️ Uptime","value":uptime,"inline":True})
+    fields.append({"name":"⚡ CPU Usage","value":f"{cpu} %","inline":True})
+    fields.append({"name":"🧠 Memory Usage","value":f"{mem_used_g} GB ({mem_percent}%)","inline":True})
+    fields.append({"name":"🛠️ Tool Memory Usage","value":f"{tool_mem_mb} MB","inline":True})
+    fields.append({"name":"🎮 Total Roblox Processes","value":f"Running: {roblox_count}","inline":False})
+    fields.append({"name":"🔍 Roblox Details","value":acc_text[:1024] if acc_text else "None","inline":False})
+    inst_text = format_instance_lines(samples)
+    fields.append({"name":"📈 Per-Instance Resources","value":inst_text[:1024] if inst_text else "None","inline":False})
+    if monitor is not None:
+        lat_text = format_latency_lines(monitor.latency)
+        fields.append({"name":"⏲️ Rejoin Latency","value":lat_text[:1024] if lat_text else "No incidents yet","inline":False})
+        if monitor.fps:
+            fps = dict(monitor.fps)
+            fields.append({"name":"🎞️ FPS","value":(f"Total {sum(fps.values())} — " + ", ".join(f"{u}: {v}" for u, v in fps.items()))[:1024],"inline":False})
+    fields.append({"name":"✅ Status","value":status_text,"inline":False})
+
+    embed = {
+        "title":"📊 System Status Monitor",
+        "description":f"Real-time report for **{device}**",
+        "color": 0x2ecc71 if roblox_count > 0 else 0xe74c3c,
+        "fields": fields,
+        "footer": {"text": "Made with 💚 by GPT TOOL", "icon_url": icon},
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+    payload = {
+        "username": "GPT TOOL",
+        "avatar_url": icon,
+        "embeds": [embed]
+    }
+    attachment = None
+    name = None
+    mime = None
+    # attach screenshot if enabled
+    if cfg.get("send_screenshot", True):
+        shot = capture_screenshot_bytes(cfg)
+        if shot and shot[0] == "unchanged":
+            fields.append({"name":"🖼️ Screen","value":"Unchanged since last report","inline":False})
+        elif shot:
+            attachment, base, mime = shot
+            # unique name so merged reports keep their own image
+            stem, ext = os.path.splitext(base)
+            name = f"{stem}_{int(time.time())}{ext}"
+            embed["image"] = {"url": f"attachment://{name}"}
+    # queue; the sender thread delivers with retry/backoff
+    get_delivery().enqueue(url, payload, kind="status", attachment=attachment, filename=name, mime=mime or "image/png")
+    return True
+
+# --- Log multiplexer: one thread follows every status_<UID>.log ---
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct("iIII")
+_INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+class Inotify:
+    # minimal ctypes binding (no extra deps on Termux); raises OSError if unsupported
+    def __init__(self):
+        import ctypes, ctypes.util
+        self._ctypes = ctypes
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}   # wd -> directory
+
+    def watch(self, d):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(d), _INOTIFY_MASK)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), f"inotify_add_watch failed for {d}")
+        self.dirs[wd] = d
+        return wd
+
+    def read(self, timeout):
+        # returns list of (directory, name, mask); None on queue overflow
+        r, _, _ = select.select([self.fd], [], [], timeout)
+        if not r:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events = []
+        off = 0
+        while off + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, ln = _INOTIFY_EVENT.unpack_from(data, off)
+            off += _INOTIFY_EVENT.size
+            name = data[off:off + ln].rstrip(b"\0").decode("utf-8", "ignore")
+            off += ln
+            if mask & IN_Q_OVERFLOW:
+                return None
+            d = self.dirs.get(wd)
+            if d is not None:
+                events.append((d, name, mask))
+        return events
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except Exception:
+            pass
+
+class FollowedLog:
+    __slots__ = ("uid", "path", "fd", "ino", "pos", "buf", "opened", "head", "mtime")
+
+    def __init__(self, uid, path):
+        self.uid = uid
+        self.path = path
+        self.fd = None
+        self.ino = None
+        self.pos = 0
+        self.buf = b""
+        self.opened = 0.0
+        self.head = b""     # first HEAD_BYTES of the file as we read them
+        self.mtime = 0      # st_mtime_ns at the last check
+
+class LogMultiplexer:
+    MAX_PARTIAL = 1 << 20   # drop a partial line that never gets its newline
+    HEAD_BYTES = 64         # re-checked to catch a truncate + rewrite past our offset
+
+    def __init__(self, q, stop, poll_interval=1.0, rescan_interval=5.0, max_bytes=0, max_age=0, keep=1):
+        self.q = q
+        self.stop = stop
+        self.poll_interval = poll_interval
+        self.rescan_interval = max(1.0, float(rescan_interval or 5))
+        self.max_bytes = int(max_bytes or 0)   # 0 = never rotate on size
+        self.max_age = float(max_age or 0)     # seconds, 0 = never rotate on age
+        self.keep = max(1, int(keep or 1))
+        self.logs = {}     # path -> FollowedLog
+        self.by_dir = {}   # directory -> {basename: path}
+        self.lock = threading.Lock()
+        self.inotify = None
+        try:
+            self.inotify = Inotify()
+        except Exception as e:
+            print("[i] inotify unavailable, polling status logs:", e)
+        self.watched = set()
+        self.thread = threading.Thread(target=self._loop, name="log-mux", daemon=True)
+
+    def add(self, uid, path, resume=None):
+        with self.lock:
+            if path in self.logs:
+                return
+            f = FollowedLog(uid, path)
+            if not (resume and self._resume(f, resume)):
+                # existing log: start at the end (old records were handled by a previous run)
+                self._open(f, from_end=True)
+            self.logs[path] = f
+            d, name = os.path.split(path)
+            self.by_dir.setdefault(d, {})[name] = path
+            if self.inotify is not None and d not in self.watched:
+                try:
+                    self.inotify.watch(d)
+                    self.watched.add(d)
+                except Exception as e:
+                    print("[i] inotify watch failed, polling", d, ":", e)
+
+    def remove(self, uid):
+        # the loop reads only under this lock, so it is never inside read() on an fd closed here
+        with self.lock:
+            for path in [p for p, f in self.logs.items() if f.uid == uid]:
+                f = self.logs.pop(path)
+                d, name = os.path.split(path)
+                self.by_dir.get(d, {}).pop(name, None)
+                if f.fd is not None:
+                    try:
+                        os.close(f.fd)
+                    except Exception:
+                        pass
+                    f.fd = None
+
+    def start(self):
+        self.thread.start()
+
+    def lag(self):
+        # path -> (uid, bytes written but not yet read)
+        with self.lock:
+            logs = list(self.logs.values())
+        out = {}
+        for f in logs:
+            try:
+                size = os.stat(f.path).st_size
+            except OSError:
+                continue
+            out[f.path] = (f.uid, max(0, size - f.pos) if f.ino is not None else size)
+        return out
+
+    def offsets(self):
+        # path -> {"ino", "pos"} for the checkpoint
+        with self.lock:
+            return {p: {"ino": f.ino, "pos": f.pos} for p, f in self.logs.items() if f.ino is not None}
+
+    def _resume(self, f, saved):
+        # continue from a checkpointed (inode, offset); False -> caller starts at the end
+        if "since" in saved:
+            # log unknown at checkpoint time: read it whole if it was written after that
+            try:
+                if os.stat(f.path).st_mtime >= float(saved["since"]):
+                    return self._open(f, from_end=False)
+            except (OSError, ValueError):
+                pass
+            return False
+        try:
+            ino, pos = int(saved["ino"]), int(saved["pos"])
+        except Exception:
+            return False
+        try:
+            st = os.stat(f.path)
+        except OSError:
+            st = None
+        if st is not None and st.st_ino == ino:
+            if st.st_size < pos or not self._open(f, from_end=False):
+                return False
+            f.pos = pos
+            self._read_head(f)
+            return True
+        try:
+            rst = os.stat(f.path + ".1")
+        except OSError:
+            return False
+        if rst.st_ino != ino:
+            return False
+        # rotated while we were down: finish the old segment, then the new one from 0
+        old = FollowedLog(f.uid, f.path + ".1")
+        if self._open(old, from_end=False):
+            old.pos = min(pos, rst.st_size)
+            self._read(old)
+            self._close(old)
+        if st is not None:
+            self._open(f, from_end=False)
+        return True
+
+    def _open(self, f, from_end):
+        try:
+            fd = os.open(f.path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except OSError:
+            return False
+        st = os.fstat(fd)
+        f.fd = fd
+        f.ino = st.st_ino
+        f.pos = st.st_size if from_end else 0
+        f.buf = b""
+        f.opened = time.time()
+        f.mtime = st.st_mtime_ns
+        self._read_head(f)
+        return True
+
+    def _close(self, f):
+        if f.fd is not None:
+            try:
+                os.close(f.fd)
+            except Exception:
+                pass
+        f.fd = None
+        f.ino = None
+        f.pos = 0
+        f.buf = b""
+        f.head = b""
+
+    def _read(self, f):
+        while True:
+            try:
+                chunk = os.pread(f.fd, 65536, f.pos)
+            except OSError:
+                return
+            if not chunk:
+                return
+            if len(f.head) < self.HEAD_BYTES and f.pos <= len(f.head):
+                f.head = (f.head + chunk[len(f.head) - f.pos:])[:self.HEAD_BYTES]
+            f.pos += len(chunk)
+            lines = (f.buf + chunk).split(b"\n")
+            f.buf = lines.pop()
+            if len(f.buf) > self.MAX_PARTIAL:
+                f.buf = b""
+            for ln in lines:
+                ln = ln.strip()
+                if ln:
+                    self.q.put((f.uid, ln.decode("utf-8", "ignore")))
+
+    def _check(self, f):
+        # caller holds self.lock
+        try:
+            st = os.stat(f.path)
+        except OSError:
+            st = None
+        if f.fd is not None:
+            if st is None or st.st_ino != f.ino:
+                # rotated/deleted: finish the old inode, then switch to the new file from 0
+                self._read(f)
+                self._close(f)
+            elif st.st_size < f.pos or (st.st_mtime_ns != f.mtime and self._rewritten(f)):
+                # truncated in place (and maybe already written back past our offset)
+                f.pos = 0
+                f.buf = b""
+                f.head = b""
+            if st is not None:
+                f.mtime = st.st_mtime_ns
+        if f.fd is None and st is not None:
+            self._open(f, from_end=False)
+        if f.fd is not None and st is not None and st.st_size > f.pos:
+            self._read(f)
+        if f.fd is not None and self._due_rotation(f):
+            self._rotate(f)
+
+    def _rewritten(self, f):
+        # same inode, not shorter, but the start of the file is not what we read there
+        try:
+            return bool(f.head) and os.pread(f.fd, len(f.head), 0) != f.head
+        except OSError:
+            return False
+
+    def _read_head(self, f):
+        # only bytes before our offset; the rest is filled in by _read
+        try:
+            f.head = os.pread(f.fd, min(self.HEAD_BYTES, f.pos), 0) if f.pos else b""
+        except OSError:
+            f.head = b""
+
+    def _due_rotation(self, f):
+        if self.max_bytes and f.pos >= self.max_bytes:
+            return True
+        return bool(self.max_age) and f.pos > 0 and time.time() - f.opened >= self.max_age
+
+    def _rotate(self, f):
+        # rename the live segment away; our fd still points at it, so anything the client
+        # appends before it notices is drained by _check before switching to the new file
+        try:
+            for i in range(self.keep, 1, -1):
+                older = f"{f.path}.{i - 1}"
+                if os.path.exists(older):
+                    os.replace(older, f"{f.path}.{i}")
+            os.replace(f.path, f.path + ".1")
+        except OSError as e:
+            print(f"[!] Rotate {f.path} failed:", e)
+            f.opened = time.time()   # don't retry on every event
+            return
+        try:
+            # signal the lua side (it acks by deleting the marker)
+            with open(os.path.splitext(f.path)[0] + ".rotate", "w") as fh:
+                fh.write(str(int(time.time())))
+        except OSError:
+            pass
+        self._check(f)
+
+    def _check_all(self):
+        # reads run under the lock, like remove(): an fd is never closed (and its number reused)
+        # while we read from it
+        with self.lock:
+            for f in list(self.logs.values()):
+                self._check(f)
+
+    def _loop(self):
+        last_scan = 0.0
+        while not self.stop.is_set():
+            try:
+                if self.inotify is None or len(self.watched) < len(self.by_dir):
+                    # no (complete) inotify coverage: stat sweep every poll interval
+                    self._check_all()
+                    self.stop.wait(self.poll_interval)
+                    continue
+                events = self.inotify.read(1.0)
+                now = time.time()
+                if events is None or now - last_scan >= self.rescan_interval:
+                    self._check_all()
+                    last_scan = now
+                    continue
+                with self.lock:
+                    touched = set()
+                    for d, name, _mask in events:
+                        path = self.by_dir.get(d, {}).get(name)
+                        if path is not None:
+                            touched.add(path)
+                    for path in touched:
+                        f = self.logs.get(path)
+                        if f is not None:
+                            self._check(f)
+            except Exception as e:
+                print("[!] log follower error:", e)
+                self.stop.wait(1)
+        with self.lock:
+            for f in self.logs.values():
+                if f.fd is not None:
+                    # keep ino/pos for the final checkpoint
+                    try:
+                        os.close(f.fd)
+                    except Exception:
+                        pass
+                    f.fd = None
+        if self.inotify is not None:
+            self.inotify.close()
+
+# --- Memory admission: relaunch only when the device has headroom ---
+def read_memory_state():
+    # bytes from /proc/meminfo, psi_some / psi_full avg10 % from /proc/pressure/memory (kernel 4.20+)
+    st = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                k, _, rest = line.partition(":")
+                if k in ("MemTotal", "MemAvailable", "SwapTotal", "SwapFree"):
+                    st[k] = int(rest.split()[0]) * 1024
+    except Exception:
+        pass
+    try:
+        with open("/proc/pressure/memory") as f:
+            for line in f:
+                kind, *fields = line.split()
+                for fv in fields:
+                    k, _, v = fv.partition("=")
+                    if k == "avg10":
+                        st[f"psi_{kind}"] = float(v)
+    except Exception:
+        pass
+    return st
+
+class MemoryAdmission:
+    def __init__(self, min_free_mb=600, swap_weight=0.25, max_psi=30.0, ttl=1.0):
+        self.min_free = max(0, float(min_free_mb)) * 1024 * 1024
+        self.swap_weight = max(0.0, float(swap_weight))
+        self.max_psi = max(0.0, float(max_psi or 0))
+        self.ttl = ttl
+        self.cached = (0.0, {})
+
+    def state(self):
+        t, st = self.cached
+        if time.time() - t > self.ttl:
+            st = read_memory_state()
+            self.cached = (time.time(), st)
+        return st
+
+    def headroom(self, st=None):
+        st = st if st is not None else self.state()
+        return st.get("MemAvailable", 0) + self.swap_weight * st.get("SwapFree", 0)
+
+    def check(self, need=0):
+        # -> (ok, reason); need = expected RSS of the clone about to start
+        if not self.min_free and not self.max_psi:
+            return True, ""
+        st = self.state()
+        if "MemAvailable" in st and self.min_free:
+            need = max(self.min_free, need)
+            room = self.headroom(st)
+            if room < need:
+                return False, f"{_fmt_mb(room)} free < {_fmt_mb(need)} needed"
+        psi = st.get("psi_some")
+        if self.max_psi and psi is not None and psi > self.max_psi:
+            return False, f"memory pressure {psi:.1f}% > {self.max_psi:g}%"
+        return True, ""
+
+# --- CPU placement: core sets / nice / ionice per clone ---
+def cpu_topology():
+    # -> (big cores, little cores) from cpufreq max freq (or cpu_capacity); uniform SoC -> both all
+    online = []
+    try:
+        with open("/sys/devices/system/cpu/online") as f:
+            for part in f.read().strip().split(","):
+                lo, _, hi = part.partition("-")
+                online.extend(range(int(lo), int(hi or lo) + 1))
+    except Exception:
+        online = list(range(os.cpu_count() or 1))
+    score = {}
+    for cpu in online:
+        for name in ("cpufreq/cpuinfo_max_freq", "cpu_capacity"):
+            try:
+                with open(f"/sys/devices/system/cpu/cpu{cpu}/{name}") as f:
+                    score[cpu] = int(f.read().strip())
+                break
+            except Exception:
+                continue
+    if not score or len(set(score.values())) < 2:
+        return online, online
+    lo = min(score.values())
+    big = [c for c in online if score.get(c, lo) > lo]
+    little = [c for c in online if score.get(c, lo) == lo]
+    return big, little
+
+class CpuPlacement:
+    POLICIES = ("off", "big", "round_robin", "priority")
+
+    def __init__(self, policy="off", per_clone=2, nice=0, ionice=None):
+        self.policy = policy if policy in self.POLICIES else "off"
+        self.per_clone = max(1, int(per_clone))
+        self.nice = int(nice or 0)
+        self.ionice = list(ionice or [])[:2]
+        self.big, self.little = cpu_topology()
+
+    def enabled(self):
+        return self.policy != "off" or self.nice or self.ionice
+
+    def _groups(self, cores):
+        n = self.per_clone
+        return [cores[i:i + n] for i in range(0, len(cores), n) if len(cores[i:i + n]) == n] or [cores]
+
+    def cores_for(self, uid, accounts, priority_of):
+        if self.policy == "big":
+            return self.big
+        if self.policy == "round_robin":
+            groups = self._groups(self.big)
+            order = sorted(accounts)
+            return groups[order.index(uid) % len(groups)] if uid in order else self.big
+        if self.policy == "priority":
+            # best accounts get their own big-core group, the rest share little-core groups
+            order = sorted(accounts, key=lambda u: (-priority_of(u), u))
+            big, little = self._groups(self.big), self._groups(self.little)
+            if uid not in order:
+                return self.little
+            i = order.index(uid)
+            return big[i] if i < len(big) else little[(i - len(big)) % len(little)]
+        return None
+
+    def script(self, pids, cores):
+        # one root shell round-trip per clone; every thread of every pid
+        cmds = []
+        if self.nice:
+            # nice of a thread = field 19 of its stat (17th after the comm)
+            cmds.append('nz() { s=$(cat $1/stat); s=${s##*) }; set -- $s; echo ${17}; }')
+        for pid in pids:
+            if cores:
+                cmds.append(f"taskset -a -p {sum(1 << c for c in cores):x} {pid} >/dev/null")
+            if self.nice or self.ionice:
+                body = []
+                if self.nice:
+                    # renice -n is an increment in toybox but absolute in util-linux: try one, check, fix
+                    n = self.nice
+                    body.append(f'renice -n $(({n} - $(nz $t))) -p ${{t##*/}} >/dev/null; '
+                                f'[ "$(nz $t)" = "{n}" ] || renice -n {n} -p ${{t##*/}} >/dev/null')
+                if self.ionice:
+                    lvl = f" -n {int(self.ionice[1])}" if len(self.ionice) > 1 else ""
+                    body.append(f"ionice -c {int(self.ionice[0])}{lvl} -p ${{t##*/}}")
+                cmds.append(f"for t in /proc/{pid}/task/*; do {'; '.join(body)}; done")
+        return "; ".join(cmds)
+
+def pin_self_to(cores):
+    # every existing thread of this process; threads started later inherit it
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        for tid in os.listdir("/proc/self/task"):
+            os.sched_setaffinity(int(tid), set(cores))
+        return True
+    except Exception as e:
+        print("[!] Could not pin monitor to cores:", e)
+        return False
+
+# --- Rejoin scheduler: due-time heap + fixed worker pool ---
+class RejoinScheduler:
+    FORCE_GAP = 30.0   # seconds between two relaunches forced past admission
+    def __init__(self, stop, action, pkg_of, workers=3, max_parallel=2, stagger=3.0,
+                 admit=None, priority_of=None, max_hold=300):
+        self.stop = stop
+        self.action = action        # callable(uid), runs on a worker
+        self.pkg_of = pkg_of        # callable(uid) -> pkg; one relaunch per package at a time
+        self.admit = admit          # callable(uid) -> (ok, reason); None admits everything
+        self.priority_of = priority_of or (lambda uid: 0)
+        self.max_hold = max(0.0, float(max_hold))
+        self.max_parallel = max(1, int(max_parallel))
+        self.stagger = max(0.0, float(stagger))
+        self.cv = threading.Condition()
+        self.heap = []              # (due, seq, uid); superseded entries are skipped lazily
+        self.ready = []             # (-priority, due, seq, uid) for due rejoins waiting on a slot/memory
+        self.pending = {}           # uid -> (due, seq)
+        self.held = {}              # uid -> first time admission refused it
+        self.forced_at = 0.0
+        self.seq = 0
+        self.active = 0
+        self.busy_pkgs = set()
+        self.next_slot = 0.0
+        self.workers = []
+        for i in range(max(1, int(workers))):
+            t = threading.Thread(target=self._worker, name=f"rejoin-{i}", daemon=True)
+            t.start()
+            self.workers.append(t)
+
+    def submit(self, uid, delay=0.0):
+        # returns False if an earlier (or equal) rejoin for uid is already pending
+        due = time.time() + max(0.0, float(delay))
+        with self.cv:
+            cur = self.pending.get(uid)
+            if cur is not None and cur[0] <= due:
+                return False
+            self._push(uid, due)
+            self.cv.notify()
+        return True
+
+    def _push(self, uid, due):
+        self.seq += 1
+        self.pending[uid] = (due, self.seq)
+        heapq.heappush(self.heap, (due, self.seq, uid))
+
+    def is_pending(self, uid):
+        with self.cv:
+            return uid in self.pending
+
+    def pending_count(self):
+        with self.cv:
+            return len(self.pending)
+
+    def pending_snapshot(self):
+        with self.cv:
+            return {uid: due for uid, (due, _seq) in self.pending.items()}
+
+    def held_count(self):
+        with self.cv:
+            return len(self.held)
+
+    def _valid(self, uid, seq):
+        return self.pending.get(uid, (0, None))[1] == seq
+
+    def _admit(self, now):
+        # -> uid to launch now, or None while memory is short
+        uid = self.ready[0][3]
+        ok, why = self.admit(uid)
+        if ok:
+            if self.held.pop(uid, None) is not None and not self.held:
+                print("[i] Memory headroom back, releasing held relaunches")
+            return uid
+        if not self.held:
+            print(f"[i] Holding relaunches: {why}")
+        for _p, _d, seq, u in self.ready:
+            if self._valid(u, seq):
+                self.held.setdefault(u, now)
+        # nobody waits forever: the longest-held rejoin goes ahead after max_hold,
+        # one at a time so the next check sees the memory it took
+        uid, since = min(self.held.items(), key=lambda kv: (kv[1], -self.priority_of(kv[0])))
+        if now - since < self.max_hold or now - self.forced_at < min(self.FORCE_GAP, self.max_hold):
+            return None
+        print(f"[!] {uid} held {int(now - since)}s ({why}), relaunching anyway")
+        del self.held[uid]
+        self.forced_at = now
+        return uid
+
+    def _next(self):
+        with self.cv:
+            while not self.stop.is_set():
+                now = time.time()
+                # due entries move to the ready heap, best account priority first
+                while self.heap and self.heap[0][0] <= now:
+                    due, seq, uid = heapq.heappop(self.heap)
+                    if self._valid(uid, seq):
+                        heapq.heappush(self.ready, (-self.priority_of(uid), due, seq, uid))
+                while self.ready and not self._valid(self.ready[0][3], self.ready[0][2]):
+                    heapq.heappop(self.ready)
+                for uid in [u for u in self.held if u not in self.pending]:
+                    del self.held[uid]
+                if not self.ready:
+                    self.cv.wait(min(max(self.heap[0][0] - now, 0.01), 1.0) if self.heap else 1.0)
+                    continue
+                wait = self.next_slot - now
+                if wait > 0:
+                    self.cv.wait(min(wait, 1.0))
+                    continue
+                if self.active >= self.max_parallel:
+                    self.cv.wait(1.0)
+                    continue
+                uid = self.ready[0][3]
+                pkg = self.pkg_of(uid)
+                if pkg and pkg in self.busy_pkgs:
+                    # same package is mid-relaunch: retry shortly
+                    heapq.heappop(self.ready)
+                    self._push(uid, now + 1.0)
+                    continue
+                if self.admit is not None:
+                    uid = self._admit(now)
+                    if uid is None:
+                        self.cv.wait(2.0)
+                        continue
+                    pkg = self.pkg_of(uid)
+                del self.pending[uid]
+                self.active += 1
+                if pkg:
+                    self.busy_pkgs.add(pkg)
+                self.next_slot = now + self.stagger
+                return uid, pkg
+        return None, None
+
+    def _worker(self):
+        while not self.stop.is_set():
+            uid, pkg = self._next()
+            if uid is None:
+                return
+            try:
+                self.action(uid)
+            except Exception as e:
+                print(f"[!] rejoin worker error for {uid}:", e)
+            finally:
+                with self.cv:
+                    self.active -= 1
+                    self.busy_pkgs.discard(pkg)
+                    self.cv.notify_all()
+
+# --- Deadline timer: min-heap of per-key deadlines, fires exactly at the earliest ---
+class DeadlineTimer:
+    def __init__(self, stop, callback, name="deadlines"):
+        self.stop = stop
+        self.callback = callback    # callback(key, deadline), runs on the timer thread
+        self.cv = threading.Condition()
+        self.heap = []              # (deadline, seq, key); superseded entries skipped lazily
+        self.current = {}           # key -> seq of its live entry
+        self.seq = 0
+        self.thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self.thread.start()
+
+    def set(self, key, deadline):
+        # O(log N); only wakes the timer if this became the earliest deadline
+        with self.cv:
+            self.seq += 1
+            self.current[key] = self.seq
+            heapq.heappush(self.heap, (deadline, self.seq, key))
+            if self.heap[0][1] == self.seq:
+                self.cv.notify()
+            if len(self.heap) > 2 * len(self.current) + 64:
+                self.heap = [e for e in self.heap if self.current.get(e[2]) == e[1]]
+                heapq.heapify(self.heap)
+
+    def cancel(self, key):
+        with self.cv:
+            self.current.pop(key, None)
+
+    def _loop(self):
+        while not self.stop.is_set():
+            with self.cv:
+                while self.heap and self.current.get(self.heap[0][2]) != self.heap[0][1]:
+                    heapq.heappop(self.heap)
+                if not self.heap:
+                    self.cv.wait(1.0)
+                    continue
+                deadline, _seq, key = self.heap[0]
+                wait = deadline - time.time()
+                if wait > 0:
+                    self.cv.wait(min(wait, 1.0))
+                    continue
+                heapq.heappop(self.heap)
+                del self.current[key]
+            try:
+                self.callback(key, deadline)
+            except Exception as e:
+                print("[!] deadline callback error:", e)
+
+# --- Launch verification: per-UID state machine with adaptive timeouts ---
+LAUNCH_STOPPING = "stopping"
+LAUNCH_VERIFY_DEAD = "verify_dead"
+LAUNCH_LAUNCHING = "launching"
+LAUNCH_WAIT_PROCESS = "wait_process"
+LAUNCH_WAIT_HEARTBEAT = "wait_heartbeat"
+LAUNCH_DONE = "done"
+LAUNCH_ESCALATE = "escalate"
+
+class AdaptiveTimeout:
+    # timeout = clamp(mult x EWMA of observed successful durations, lo, hi)
+    def __init__(self, initial, lo, hi, mult=3.0, alpha=0.3):
+        self.avg = initial / mult
+        self.lo, self.hi, self.mult, self.alpha = lo, hi, mult, alpha
+
+    def timeout(self):
+        return min(self.hi, max(self.lo, self.avg * self.mult))
+
+    def observe(self, duration):
+        self.avg = self.alpha * duration + (1 - self.alpha) * self.avg
+
+class LaunchState:
+    def __init__(self, uid, pkg):
+        self.uid = uid
+        self.pkg = pkg
+        self.state = LAUNCH_STOPPING
+        self.started = time.time()
+        self.since = self.started     # when the current state was entered
+        self.launched = None          # launch command time (heartbeats must be newer)
+        self.deadline = None          # heartbeat deadline while in wait_heartbeat
+        self.reason = ""
+        self.done = threading.Event()
+
+    def set(self, state, reason=""):
+        now = time.time()
+        prev, spent = self.state, now - self.since
+        self.state, self.since, self.reason = state, now, reason
+        if state in (LAUNCH_DONE, LAUNCH_ESCALATE):
+            self.done.set()
+        return prev, spent
+
+# --- Rejoin latency: per-incident phase timestamps -> histograms / percentiles ---
+# metric -> (from mark, to mark); marks: event, detect, schedule, dispatch, stop, launch, proc, heartbeat
+LATENCY_PHASES = (
+    ("detect", "event", "detect"),        # record written -> seen by the worker
+    ("queue", "schedule", "dispatch"),    # first-rejoin delay / jitter / launch slots
+    ("stop", "dispatch", "stop"),         # force-stop until the process is gone
+    ("launch", "stop", "launch"),         # am start / monkey returned
+    ("process", "launch", "proc"),        # process visible in /proc
+    ("heartbeat", "proc", "heartbeat"),   # first RUNNING record after relaunch
+    ("total", "event", "heartbeat"),      # time the account was offline
+)
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 30, 60, 120, 300, 600, float("inf"))
+
+class LatencyStats:
+    def __init__(self, per_uid=64, overall=512):
+        self.lock = threading.Lock()
+        self.per_uid = per_uid
+        self.overall = overall
+        self.all = {m: deque(maxlen=overall) for m, _a, _b in LATENCY_PHASES}
+        self.by_uid = {}
+        self.buckets = {m: [0] * len(LATENCY_BUCKETS) for m, _a, _b in LATENCY_PHASES}
+        self.sums = {m: 0.0 for m, _a, _b in LATENCY_PHASES}
+
+    def add_incident(self, uid, marks):
+        durations = {}
+        for metric, a, b in LATENCY_PHASES:
+            if a in marks and b in marks:
+                durations[metric] = max(0.0, marks[b] - marks[a])
+        with self.lock:
+            per = self.by_uid.setdefault(uid, {})
+            for metric, d in durations.items():
+                self.all[metric].append(d)
+                per.setdefault(metric, deque(maxlen=self.per_uid)).append(d)
+                self.sums[metric] += d
+                for i, le in enumerate(LATENCY_BUCKETS):
+                    if d <= le:
+                        self.buckets[metric][i] += 1
+        return durations
+
+    @staticmethod
+    def percentiles(values, ps=(50, 95, 99)):
+        vals = sorted(values)
+        if not vals:
+            return {}
+        # nearest-rank
+        return {f"p{p}": vals[min(len(vals) - 1, max(0, math.ceil(p / 100.0 * len(vals)) - 1))] for p in ps}
+
+    def summary(self, uid=None):
+        with self.lock:
+            src = self.all if uid is None else self.by_uid.get(uid, {})
+            out = {}
+            for metric, vals in src.items():
+                if vals:
+                    out[metric] = dict(self.percentiles(vals), n=len(vals))
+            return out
+
+    def uids(self):
+        with self.lock:
+            return list(self.by_uid)
+
+    def to_json(self):
+        with self.lock:
+            return {"all": {m: list(v) for m, v in self.all.items()},
+                    "by_uid": {u: {m: list(v) for m, v in d.items()} for u, d in self.by_uid.items()},
+                    "buckets": self.buckets, "sums": self.sums}
+
+    def load(self, data):
+        if not isinstance(data, dict):
+            return
+        with self.lock:
+            for m, vals in (data.get("all") or {}).items():
+                if m in self.all:
+                    self.all[m].extend(vals)
+            for u, d in (data.get("by_uid") or {}).items():
+                self.by_uid[u] = {m: deque(vals, maxlen=self.per_uid) for m, vals in d.items()}
+            for m, counts in (data.get("buckets") or {}).items():
+                if m in self.buckets and len(counts) == len(LATENCY_BUCKETS):
+                    self.buckets[m] = list(counts)
+            for m, v in (data.get("sums") or {}).items():
+                if m in self.sums:
+                    self.sums[m] = float(v)
+
+def format_latency_lines(stats, worst=5):
+    # aggregate line per metric + the UIDs with the worst p95 offline time
+    lines = []
+    agg = stats.summary()
+    for metric, _a, _b in LATENCY_PHASES:
+        s = agg.get(metric)
+        if s:
+            lines.append(f"{metric}: p50 {s['p50']:.1f}s p95 {s['p95']:.1f}s p99 {s['p99']:.1f}s (n={s['n']})")
+    per = []
+    for uid in stats.uids():
+        s = stats.summary(uid).get("total")
+        if s:
+            per.append((s["p95"], uid, s))
+    per.sort(reverse=True)
+    for _p95, uid, s in per[:worst]:
+        lines.append(f"{uid} offline p50 {s['p50']:.1f}s p95 {s['p95']:.1f}s (n={s['n']})")
+    return "\n".join(lines)
+
+# --- Circuit breaker: stop relaunching clones that never stay up ---
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half-open"
+BREAKER_LEVEL = {BREAKER_CLOSED: 0, BREAKER_HALF_OPEN: 1, BREAKER_OPEN: 2}
+
+class CircuitBreaker:
+    def __init__(self, failures=3, window=900, healthy=120, backoff=(60, 3600)):
+        self.lock = threading.Lock()
+        self.failures = max(0, int(failures))
+        self.window = float(window)
+        self.healthy = float(healthy)
+        self.base, self.cap = float(backoff[0]), float(backoff[1])
+        self.uids = {}   # uid -> state; a UID that stays up is dropped (closed, no strikes)
+
+    def _get(self, uid):
+        b = self.uids.get(uid)
+        if b is None:
+            b = self.uids[uid] = {"state": BREAKER_CLOSED, "strikes": deque(), "opens": 0,
+                                  "until": 0.0, "attempt": 0.0, "up_since": None}
+        return b
+
+    def _open(self, b, now):
+        b["opens"] += 1
+        b["state"] = BREAKER_OPEN
+        b["until"] = now + min(self.cap, self.base * 2 ** (b["opens"] - 1))
+        b["strikes"].clear()
+
+    def hold(self, uid, now=None):
+        # seconds until uid may relaunch (0 = now)
+        with self.lock:
+            b = self.uids.get(uid)
+            if b is None or b["state"] != BREAKER_OPEN:
+                return 0.0
+            return max(0.0, b["until"] - (now or time.time()))
+
+    def on_attempt(self, uid, now=None):
+        # a relaunch is about to run -> (allowed, (old, new) or None)
+        if not self.failures:
+            return True, None
+        now = now or time.time()
+        with self.lock:
+            b = self._get(uid)
+            old = b["state"]
+            if old == BREAKER_OPEN:
+                if now < b["until"]:
+                    return False, None
+                b["state"] = BREAKER_HALF_OPEN   # this relaunch is the probe
+            elif old == BREAKER_HALF_OPEN:
+                # the probe never stayed up
+                self._open(b, now)
+                return False, (old, BREAKER_OPEN)
+            else:
+                while b["strikes"] and b["strikes"][0] < now - self.window:
+                    b["strikes"].popleft()
+                if len(b["strikes"]) >= self.failures:
+                    self._open(b, now)
+                    return False, (old, BREAKER_OPEN)
+                b["strikes"].append(now)
+            b["attempt"] = now
+            b["up_since"] = None
+            return True, ((old, b["state"]) if b["state"] != old else None)
+
+    def on_running(self, uid, t):
+        # RUNNING heartbeat: `healthy` seconds of them after the last relaunch reset the breaker
+        with self.lock:
+            b = self.uids.get(uid)
+            if b is None or t + 1 < b["attempt"]:
+                return None
+            if b["up_since"] is None:
+                b["up_since"] = t
+            if t - b["up_since"] < self.healthy:
+                return None
+            del self.uids[uid]
+            return (b["state"], BREAKER_CLOSED) if b["state"] != BREAKER_CLOSED else None
+
+    def states(self):
+        with self.lock:
+            return {uid: b["state"] for uid, b in self.uids.items()}
+
+    def to_json(self):
+        with self.lock:
+            return {uid: {"state": b["state"], "strikes": list(b["strikes"]), "opens": b["opens"],
+                          "until": b["until"], "attempt": b["attempt"]} for uid, b in self.uids.items()}
+
+    def load(self, data):
+        if not isinstance(data, dict):
+            return
+        with self.lock:
+            for uid, d in data.items():
+                b = self._get(uid)
+                b["state"] = d.get("state") if d.get("state") in BREAKER_LEVEL else BREAKER_CLOSED
+                b["strikes"].extend(float(x) for x in d.get("strikes") or [])
+                b["opens"] = int(d.get("opens", 0))
+                b["until"] = float(d.get("until", 0))
+                b["attempt"] = float(d.get("attempt", 0))
+
+# --- Metrics: in-process counters + OpenMetrics text over HTTP ---
+METRIC_FAMILIES = {
+    "gpt_records_parsed": ("counter", "Status records parsed per UID"),
+    "gpt_severe_events": ("counter", "Severe events by code"),
+    "gpt_rule_matches": ("counter", "Records matched by a severity rule, by rule and action"),
+    "gpt_rejoins_attempted": ("counter", "Relaunch sequences started"),
+    "gpt_rejoins_succeeded": ("counter", "Relaunches that reached their first heartbeat"),
+    "gpt_rejoins_failed": ("counter", "Relaunches that escalated"),
+    "gpt_breaker_transitions": ("counter", "Circuit breaker state changes per UID"),
+    "gpt_breaker_state": ("gauge", "Circuit breaker state per UID (0 closed, 1 half-open, 2 open)"),
+    "gpt_queue_depth": ("gauge", "Lines waiting in the monitor queue"),
+    "gpt_rejoins_pending": ("gauge", "Rejoins waiting in the scheduler"),
+    "gpt_follower_lag_bytes": ("gauge", "Bytes written to a status log but not yet read"),
+    "gpt_rejoins_held": ("gauge", "Due rejoins held back by memory admission"),
+    "gpt_mem_available_bytes": ("gauge", "MemAvailable from /proc/meminfo"),
+    "gpt_mem_swap_free_bytes": ("gauge", "SwapFree from /proc/meminfo"),
+    "gpt_mem_pressure_avg10": ("gauge", "Memory PSI avg10 in percent"),
+    "gpt_clone_fps": ("gauge", "Physics FPS from the latest heartbeat"),
+    "gpt_threads": ("gauge", "Live Python threads in the tool"),
+    "gpt_tool_rss_bytes": ("gauge", "Resident memory of the tool"),
+    "gpt_clone_rss_bytes": ("gauge", "Resident memory per Roblox clone"),
+    "gpt_clone_cpu_seconds": ("counter", "CPU time per Roblox clone"),
+    "gpt_clone_running": ("gauge", "1 if the clone's package has a live process"),
+    "gpt_rejoin_latency_seconds": ("histogram", "Rejoin phase latency"),
+}
+
+class MonitorMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}   # (family, ((label, value), ...)) -> value
+
+    def inc(self, family, labels=(), n=1):
+        key = (family, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def items(self):
+        with self.lock:
+            return list(self.counters.items())
+
+def _om_labels(labels):
+    if not labels:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels) + "}"
+
+def render_openmetrics(mon):
+    samples = {name: [] for name in METRIC_FAMILIES}   # family -> [(suffix, labels, value)]
+    for (family, labels), v in mon.metrics.items():
+        samples[family].append(("_total", labels, v))
+    samples["gpt_queue_depth"].append(("", (), mon.q.qsize()))
+    samples["gpt_rejoins_pending"].append(("", (), mon.scheduler.pending_count()))
+    samples["gpt_rejoins_held"].append(("", (), mon.scheduler.held_count()))
+    mem = mon.admission.state()
+    if "MemAvailable" in mem:
+        samples["gpt_mem_available_bytes"].append(("", (), mem["MemAvailable"]))
+        samples["gpt_mem_swap_free_bytes"].append(("", (), mem.get("SwapFree", 0)))
+    for kind in ("some", "full"):
+        if f"psi_{kind}" in mem:
+            samples["gpt_mem_pressure_avg10"].append(("", (("kind", kind),), mem[f"psi_{kind}"]))
+    for path, (uid, lag) in mon.follower.lag().items():
+        samples["gpt_follower_lag_bytes"].append(("", (("uid", uid), ("path", path)), lag))
+    for uid, state in mon.breaker.states().items():
+        samples["gpt_breaker_state"].append(("", (("uid", uid),), BREAKER_LEVEL[state]))
+    for uid, fps in list(mon.fps.items()):
+        samples["gpt_clone_fps"].append(("", (("uid", uid),), fps))
+    samples["gpt_threads"].append(("", (), threading.active_count()))
+    try:
+        with open("/proc/self/statm") as f:
+            samples["gpt_tool_rss_bytes"].append(("", (), int(f.read().split()[1]) * _PAGE_SIZE))
+    except Exception:
+        pass
+    snap = process_snapshot()
+    for uid, info in mon.accounts.items():
+        pkg = info.get("pkg") or ""
+        ent = snap.get(pkg)
+        labels = (("uid", uid), ("pkg", pkg))
+        samples["gpt_clone_running"].append(("", labels, 1 if ent else 0))
+        if ent:
+            samples["gpt_clone_rss_bytes"].append(("", labels, ent["rss"]))
+            samples["gpt_clone_cpu_seconds"].append(("_total", labels, round(ent["cpu"], 2)))
+    lat = mon.latency.to_json()
+    for metric, counts in lat["buckets"].items():
+        for le, c in zip(LATENCY_BUCKETS, counts):
+            samples["gpt_rejoin_latency_seconds"].append(
+                ("_bucket", (("phase", metric), ("le", "+Inf" if le == float("inf") else f"{le:g}")), c))
+        samples["gpt_rejoin_latency_seconds"].append(("_count", (("phase", metric),), counts[-1]))
+        samples["gpt_rejoin_latency_seconds"].append(("_sum", (("phase", metric),), round(lat["sums"][metric], 3)))
+    out = []
+    for family, (mtype, help_) in METRIC_FAMILIES.items():
+        out.append(f"# TYPE {family} {mtype}")
+        out.append(f"# HELP {family} {help_}")
+        for suffix, labels, v in samples[family]:
+            out.append(f"{family}{suffix}{_om_labels(labels)} {v}")
+    out.append("# EOF")
+    return "\n".join(out) + "\n"
+
+def start_metrics_server(mon, port, bind="127.0.0.1"):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            try:
+                body = render_openmetrics(mon).encode("utf-8")
+            except Exception as e:
+                self.send_error(500, str(e))
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer((bind, int(port)), Handler)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"[i] Metrics on http://{bind}:{srv.server_port}/metrics")
+    return srv
+
+# --- Event store: append-only status history in sqlite ---
+EVENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    t REAL NOT NULL,
+    uid TEXT NOT NULL,
+    kind TEXT NOT NULL,        -- record / rejoin / launch
+    event TEXT,
+    code TEXT,
+    severity TEXT,
+    detail TEXT,
+    dur REAL
+);
+CREATE INDEX IF NOT EXISTS events_uid_t ON events (uid, t);
+CREATE INDEX IF NOT EXISTS events_code_t ON events (code, t);
+"""
+
+def _open_events_db(path, fresh=False):
+    db = optional_import("sqlite3").connect(path, timeout=10, check_same_thread=False)
+    if fresh:
+        # must be set before the first page is written (WAL switch included)
+        db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+class EventStore:
+    def __init__(self, path, retention_days=7, batch=500, flush_interval=1.0, maint_interval=3600):
+        self.path = path
+        self.retention = max(0.0, float(retention_days)) * 86400
+        self.batch = batch
+        self.flush_interval = flush_interval
+        self.maint_interval = maint_interval
+        self.q = queue.SimpleQueue()
+        self.stop = threading.Event()
+        self.written = 0
+        self.thread = threading.Thread(target=self._loop, name="event-store", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def add(self, kind, uid, t, event=None, code=None, severity=None, detail=None, dur=None):
+        # hot path: one tuple onto a lock-free queue, the writer thread does the rest
+        self.q.put((t, str(uid), kind, event, code or None, severity, detail, dur))
+
+    def close(self, timeout=5):
+        self.stop.set()
+        self.thread.join(timeout)
+
+    def _init(self):
+        ensure_dir(os.path.dirname(self.path) or ".")
+        fresh = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        db = _open_events_db(self.path, fresh)
+        db.executescript(EVENT_SCHEMA)
+        db.commit()
+        return db
+
+    def _drain(self, first=None):
+        rows = [] if first is None else [first]
+        while len(rows) < self.batch:
+            try:
+                rows.append(self.q.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write(self, db, rows):
+        if not rows:
+            return
+        with db:
+            db.executemany("INSERT INTO events (t, uid, kind, event, code, severity, detail, dur) "
+                           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.written += len(rows)
+
+    def _maintain(self, db):
+        if self.retention:
+            with db:
+                n = db.execute("DELETE FROM events WHERE t < ?", (time.time() - self.retention,)).rowcount
+            if n:
+                # executescript steps the pragma to completion (execute frees a single page)
+                db.executescript("PRAGMA incremental_vacuum")
+        db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _loop(self):
+        try:
+            db = self._init()
+        except Exception as e:
+            print("[!] Event store disabled:", e)
+            return
+        next_maint = time.time() + 60
+        while not self.stop.is_set():
+            try:
+                first = self.q.get(timeout=self.flush_interval)
+            except queue.Empty:
+                first = None
+            try:
+                self._write(db, self._drain(first))
+                if time.time() >= next_maint:
+                    self._maintain(db)
+                    next_maint = time.time() + self.maint_interval
+            except Exception as e:
+                print("[!] Event store write error:", e)
+                time.sleep(1)
+        try:
+            rows = self._drain()
+            while rows:
+                self._write(db, rows)
+                rows = self._drain()
+            db.close()
+        except Exception as e:
+            print("[!] Event store close error:", e)
+
+def _query_events(sql, args=(), path=None):
+    path = path or EVENTS_DB
+    if not os.path.exists(path) or optional_import("sqlite3") is None:
+        return []
+    db = _open_events_db(path)
+    try:
+        return db.execute(sql, args).fetchall()
+    finally:
+        db.close()
+
+def query_kicks_per_uid(hours=24, path=None):
+    # uid, kicks, severe records, rejoins, seconds offline (completed relaunches)
+    # kicks: KICK records (player removed) plus kick prompts, which the Lua writes as ERROR/KICK_OR_DISCONNECT
+    return _query_events("""
+        SELECT uid,
+               SUM(kind = 'record' AND (event = 'KICK' OR code = 'KICK_OR_DISCONNECT')),
+               SUM(kind = 'record' AND severity = 'SEVERE'),
+               SUM(kind = 'rejoin'),
+               COALESCE(SUM(CASE WHEN kind = 'launch' AND event = ? THEN dur END), 0)
+        FROM events WHERE t >= ? GROUP BY uid ORDER BY 2 DESC, 3 DESC, 5 DESC
+    """, (LAUNCH_DONE, time.time() - hours * 3600), path)
+
+def query_top_codes(hours=24, limit=10, path=None):
+    # code, severe records, affected uids, seconds offline attributed to the code
+    return _query_events("""
+        SELECT code,
+               SUM(kind = 'record'),
+               COUNT(DISTINCT uid),
+               COALESCE(SUM(CASE WHEN kind = 'launch' AND event = ? THEN dur END), 0)
+        FROM events WHERE code IS NOT NULL AND t >= ?
+              AND (kind = 'launch' OR severity = 'SEVERE')
+        GROUP BY code ORDER BY 2 DESC, 4 DESC LIMIT ?
+    """, (LAUNCH_DONE, time.time() - hours * 3600, limit), path)
+
+def print_event_report(hours=24, limit=10):
+    if optional_import("sqlite3") is None:
+        print("[!] sqlite3 module not available.")
+        return
+    if not os.path.exists(EVENTS_DB):
+        print(f"[i] No event history yet ({EVENTS_DB}).")
+        return
+    print(f"Kicks per UID (last {hours:g}h):")
+    print(f"  {'uid':<14} {'kicks':>6} {'severe':>7} {'rejoins':>8} {'offline':>9}")
+    for uid, kicks, severe, rejoins, offline in query_kicks_per_uid(hours):
+        print(f"  {uid:<14} {kicks or 0:>6} {severe or 0:>7} {rejoins or 0:>8} {_fmt_secs(offline):>9}")
+    print(f"\nTop error codes (last {hours:g}h):")
+    print(f"  {'code':<22} {'count':>6} {'uids':>5} {'offline':>9}")
+    for code, count, uids, offline in query_top_codes(hours, limit):
+        print(f"  {code:<22} {count or 0:>6} {uids:>5} {_fmt_secs(offline):>9}")
+
+# --- Monitor class: follow logs and decide rejoin ---
+class RejoinMonitor:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.started = time.time()
+        # handle exec_workspace possibly being list in config
+        exec_cfg = cfg.get("exec_workspace", DEFAULT_EXEC_WS)
+        if isinstance(exec_cfg, (list, tuple)):
+            self.exec_ws = exec_cfg[0] if len(exec_cfg) > 0 else DEFAULT_EXEC_WS
+            self.exec_ws_list = list(exec_cfg)
+        else:
+            self.exec_ws = exec_cfg
+            self.exec_ws_list = [exec_cfg]
+        # ensure each workspace has report dir
+        for ws in self.exec_ws_list:
+            ensure_dir(os.path.join(ws, REPORT_DIRNAME))
+
+        self.report_dir = os.path.join(self.exec_ws, REPORT_DIRNAME)
+        self.accounts = load_accounts()
+        self.q = queue.Queue()
+        self.stop = threading.Event()
+        self.last_action = {}    # uid -> timestamp of last rejoin
+        self.first_rejoined = {} # uid -> bool
+        self.last_seen = {}      # uid -> last 't' from log
+        self.launches = {}       # uid -> LaunchState of the latest relaunch
+        self.incidents = {}      # uid -> phase timestamps of the open incident
+        self.latency = LatencyStats()
+        self.metrics = MonitorMetrics()
+        self.events = None
+        if cfg.get("event_store", DEFAULT_CONFIG["event_store"]) and optional_import("sqlite3") is not None:
+            self.events = EventStore(EVENTS_DB, cfg.get("event_retention_days", DEFAULT_CONFIG["event_retention_days"])).start()
+        self.latency.load(load_json(LATENCY_FILE, {}))
+        self.launch_timeouts = {
+            LAUNCH_VERIFY_DEAD: AdaptiveTimeout(2, 0.5, 8),
+            LAUNCH_WAIT_PROCESS: AdaptiveTimeout(8, 2, 30),
+            LAUNCH_WAIT_HEARTBEAT: AdaptiveTimeout(60, 20, 180),
+        }
+        self.rejoin_cooldown = DEFAULT_REJOIN_COOLDOWN
+        self.first_delay = cfg.get("first_rejoin_delay", DEFAULT_CONFIG["first_rejoin_delay"])
+        self.heartbeat_stale = cfg.get("heartbeat_stale", DEFAULT_CONFIG["heartbeat_stale"])
+        self.checkpoint_interval = max(5, int(cfg.get("checkpoint_interval", DEFAULT_CONFIG["checkpoint_interval"]) or 30))
+        self.breaker = CircuitBreaker(
+            failures=cfg.get("breaker_failures", DEFAULT_CONFIG["breaker_failures"]),
+            window=cfg.get("breaker_window", DEFAULT_CONFIG["breaker_window"]),
+            healthy=cfg.get("breaker_healthy", DEFAULT_CONFIG["breaker_healthy"]),
+            backoff=cfg.get("breaker_backoff", DEFAULT_CONFIG["breaker_backoff"]))
+        self.admission = MemoryAdmission(
+            min_free_mb=cfg.get("admission_min_free_mb", DEFAULT_CONFIG["admission_min_free_mb"]),
+            swap_weight=cfg.get("admission_swap_weight", DEFAULT_CONFIG["admission_swap_weight"]),
+            max_psi=cfg.get("admission_max_psi", DEFAULT_CONFIG["admission_max_psi"]))
+        self.last_trim = 0.0
+        self.placement = CpuPlacement(
+            policy=cfg.get("affinity_policy", DEFAULT_CONFIG["affinity_policy"]),
+            per_clone=cfg.get("affinity_cores_per_clone", DEFAULT_CONFIG["affinity_cores_per_clone"]),
+            nice=cfg.get("clone_nice", DEFAULT_CONFIG["clone_nice"]),
+            ionice=cfg.get("clone_ionice", DEFAULT_CONFIG["clone_ionice"]))
+        self.fps = {}            # uid -> fps from the latest heartbeat
+        self.saved = self._load_state()
+        # stale heartbeats and launch heartbeat deadlines share one timer heap
+        self.deadlines = DeadlineTimer(self.stop, self._on_deadline)
+        for uid, t in self.last_seen.items():
+            # restored state: give the backlog one stale interval to catch up before firing
+            self.deadlines.set(uid, max(t, time.time()) + self.heartbeat_stale)
+        # start watchers & worker & periodic webhook thread
+        self._start_watchers()
+        self.scheduler = RejoinScheduler(
+            self.stop, self._do_rejoin, lambda uid: self.accounts.get(uid, {}).get("pkg"),
+            workers=cfg.get("rejoin_workers", DEFAULT_CONFIG["rejoin_workers"]),
+            max_parallel=cfg.get("max_parallel_launches", DEFAULT_CONFIG["max_parallel_launches"]),
+            stagger=cfg.get("launch_stagger", DEFAULT_CONFIG["launch_stagger"]),
+            admit=self._admit, priority_of=self._priority,
+            max_hold=cfg.get("admission_max_hold", DEFAULT_CONFIG["admission_max_hold"]))
+        for uid, due in (self.saved.get("pending") or {}).items():
+            if uid in self.accounts:
+                self.scheduler.submit(uid, float(due) - time.time())
+        self.saved = None
+        ACCOUNTS_STORE.subscribe(self._on_accounts_changed)
+        self.rules = load_rules()
+        RULES_STORE.subscribe(self._on_rules_changed)
+        self.housekeeping_t = threading.Thread(target=self._housekeeping_loop, daemon=True)
+        self.housekeeping_t.start()
+        self.worker_t = threading.Thread(target=self._worker_loop, daemon=True)
+        self.worker_t.start()
+        self.webhook_thread = threading.Thread(target=self._periodic_webhook_loop, daemon=True)
+        self.webhook_thread.start()
+        self.metrics_server = None
+        port = int(cfg.get("metrics_port", DEFAULT_CONFIG["metrics_port"]) or 0)
+        if port:
+            try:
+                self.metrics_server = start_metrics_server(self, port, cfg.get("metrics_bind", DEFAULT_CONFIG["metrics_bind"]))
+            except Exception as e:
+                print("[!] Metrics server failed to start:", e)
+        if cfg.get("monitor_little_cores", DEFAULT_CONFIG["monitor_little_cores"]) \
+                and self.placement.little != self.placement.big and pin_self_to(self.placement.little):
+            print(f"[i] Monitor pinned to little cores {self.placement.little}")
+        if self.placement.enabled():
+            threading.Thread(target=self._place_all, name="placement", daemon=True).start()
+        if cfg.get("cold_start", DEFAULT_CONFIG["cold_start"]):
+            threading.Thread(target=self._cold_start, name="cold-start", daemon=True,
+                             args=(cfg.get("cold_start_batch", DEFAULT_CONFIG["cold_start_batch"]),
+                                   cfg.get("cold_start_timeout", DEFAULT_CONFIG["cold_start_timeout"]))).start()
+
+    def _start_watchers(self):
+        # one multiplexer thread follows every (uid x workspace) log
+        self.follower = LogMultiplexer(
+            self.q, self.stop,
+            rescan_interval=self.cfg.get("log_rescan_interval", DEFAULT_CONFIG["log_rescan_interval"]),
+            max_bytes=int(self.cfg.get("log_max_kb", DEFAULT_CONFIG["log_max_kb"]) or 0) * 1024,
+            max_age=float(self.cfg.get("log_max_age_h", DEFAULT_CONFIG["log_max_age_h"]) or 0) * 3600,
+            keep=self.cfg.get("log_keep_segments", DEFAULT_CONFIG["log_keep_segments"]))
+        offsets = self.saved.get("offsets") or {}
+        for uid in list(self.accounts.keys()):
+            for ws in self.exec_ws_list:
+                path = os.path.join(ws, REPORT_DIRNAME, f"status_{uid}.log")
+                resume = offsets.get(path)
+                if resume is None and self.saved.get("saved"):
+                    resume = {"since": self.saved["saved"]}
+                self.follower.add(uid, path, resume=resume)
+        self.follower.start()
+
+    # --- checkpoint: state survives restarts (atomic write, restored in __init__) ---
+    def _load_state(self):
+        st = load_json(STATE_FILE, {})
+        if not isinstance(st, dict):
+            return {}
+        known = self.accounts
+        self.last_action.update({u: float(v) for u, v in (st.get("last_action") or {}).items() if u in known})
+        self.first_rejoined.update({u: bool(v) for u, v in (st.get("first_rejoined") or {}).items() if u in known})
+        self.last_seen.update({u: int(v) for u, v in (st.get("last_seen") or {}).items() if u in known})
+        self.breaker.load({u: v for u, v in (st.get("breaker") or {}).items() if u in known})
+        if st:
+            print(f"[i] Restored monitor state ({len(self.last_seen)} UIDs, saved {int(time.time() - st.get('saved', 0))}s ago)")
+        return st
+
+    def save_state(self):
+        st = {
+            "saved": time.time(),
+            "last_action": dict(self.last_action),
+            "first_rejoined": dict(self.first_rejoined),
+            "last_seen": dict(self.last_seen),
+            "pending": self.scheduler.pending_snapshot(),
+            "offsets": self.follower.offsets(),
+            "breaker": self.breaker.to_json(),
+        }
+        try:
+            write_atomic(STATE_FILE, json.dumps(st, separators=(",", ":")).encode("utf-8"))
+            write_atomic(LATENCY_FILE, json.dumps(self.latency.to_json(), separators=(",", ":")).encode("utf-8"))
+        except Exception as e:
+            print("[!] checkpoint error:", e)
+
+    def _housekeeping_loop(self):
+        # account file watch (cheap stat) every 2s, process snapshot while rejoins are pending,
+        # checkpoint every checkpoint_interval
+        next_cp = time.time() + self.checkpoint_interval
+        while not self.stop.wait(2):
+            ACCOUNTS_STORE.poll()
+            RULES_STORE.poll()
+            if self.scheduler.pending_count():
+                process_snapshot()   # refreshed here, outside the scheduler lock, for admission
+            if time.time() >= next_cp:
+                self.save_state()
+                next_cp = time.time() + self.checkpoint_interval
+
+    def reload_config(self, cfg):
+        # live tunables only; worker counts, sockets and the Lua need a restart
+        self.cfg = cfg
+        self.first_delay = cfg.get("first_rejoin_delay", DEFAULT_CONFIG["first_rejoin_delay"])
+        self.heartbeat_stale = cfg.get("heartbeat_stale", DEFAULT_CONFIG["heartbeat_stale"])
+        self.checkpoint_interval = max(5, int(cfg.get("checkpoint_interval", DEFAULT_CONFIG["checkpoint_interval"]) or 30))
+        self.scheduler.stagger = max(0.0, float(cfg.get("launch_stagger", DEFAULT_CONFIG["launch_stagger"])))
+        self.scheduler.max_parallel = max(1, int(cfg.get("max_parallel_launches", DEFAULT_CONFIG["max_parallel_launches"])))
+        print("[i] Config reloaded")
+
+    def _on_accounts_changed(self, accounts):
+        # live pickup: follow new UIDs, drop removed ones, take pkg/gid edits
+        accounts = {uid: dict(info) for uid, info in accounts.items() if isinstance(info, dict)}
+        added = [uid for uid in accounts if uid not in self.accounts]
+        removed = [uid for uid in self.accounts if uid not in accounts]
+        self.accounts = accounts
+        for uid in added:
+            for ws in self.exec_ws_list:
+                self.follower.add(uid, os.path.join(ws, REPORT_DIRNAME, f"status_{uid}.log"))
+        for uid in removed:
+            self.follower.remove(uid)
+            self.last_seen.pop(uid, None)
+            self.fps.pop(uid, None)
+            self.deadlines.cancel(uid)
+        if added or removed:
+            print(f"[i] Accounts reloaded: +{len(added)} -{len(removed)} ({len(accounts)} total)")
+
+    def _on_rules_changed(self, data):
+        # hot reload; a broken edit keeps the running rules (a file that does not parse is never
+        # delivered here, a deleted one arrives as {}). the Lua is rewritten for the next launch
+        if not data and not os.path.exists(RULES_FILE):
+            print(f"[!] {RULES_FILE} removed, keeping rules {self.rules.version}")
+            return
+        try:
+            rules = RuleSet(data)
+        except ValueError as e:
+            print(f"[!] {RULES_FILE} rejected, keeping rules {self.rules.version}: {e}")
+            return
+        if rules.version == self.rules.version:
+            return
+        self.rules = rules
+        print(f"[i] Rules reloaded: {len(rules.rules)} rule(s), version {rules.version}")
+        install_lua(cfg=self.cfg, rules=rules)
+
+    def _parse_line(self, ln):
+        return parse_status_line(ln)
+
+    def _jitter(self):
+        try:
+            lo, hi = self.cfg.get("rejoin_jitter", DEFAULT_CONFIG["rejoin_jitter"])
+            lo, hi = int(lo), int(hi)
+        except Exception:
+            lo, hi = DEFAULT_CONFIG["rejoin_jitter"]
+        return random.randint(min(lo, hi), max(lo, hi))
+
+    def _schedule_rejoin(self, uid, event_t=None, cause="", extra=0):
+        detect = time.time()
+        # check cooldown
+        last = self.last_action.get(uid, 0)
+        if detect - last < self.rejoin_cooldown:
+            print(f"[i] Skip rejoin {uid}: cooldown")
+            return
+        # first rejoin delay (avoid collision), jitter afterwards; the worker pool never sleeps
+        if not self.first_rejoined.get(uid, False):
+            delay = self.first_delay + random.randint(0,5)
+            msg = f"[i] First rejoin for {uid}: waiting {delay}s before rejoin"
+        else:
+            delay = self._jitter()
+            msg = f"[i] Rejoin uid {uid}: jitter {delay}s"
+        if extra:
+            delay += int(math.ceil(extra))
+            msg += f" (+{int(math.ceil(extra))}s rule delay)"
+        hold = self.breaker.hold(uid, detect)
+        if hold > delay:
+            delay = hold
+            msg = f"[i] Rejoin uid {uid}: circuit open, probe in {int(hold)}s"
+        if self.scheduler.submit(uid, delay):
+            print(msg)
+            if self.events:
+                ev, _, code = cause.partition("/")
+                self.events.add("rejoin", uid, detect, ev, code or ev, None, f"delay {delay}s")
+            if uid not in self.incidents:
+                self.incidents[uid] = {"event": detect if event_t is None else event_t, "detect": detect,
+                                       "schedule": time.time(), "cause": cause, "attempts": 0}
+        else:
+            print(f"[i] Skip rejoin {uid}: already pending")
+
+    # --- cold start: bring up every account that is not running, k at a time ---
+    def _cold_start(self, k=2, timeout=180):
+        t0 = time.time()
+        snap = process_snapshot(0)
+        todo = [uid for uid, info in self.accounts.items() if info.get("pkg") and info["pkg"] not in snap]
+        if not todo:
+            return
+        todo.sort(key=self._priority, reverse=True)
+        total = len(todo)
+        print(f"[i] Cold start: {total} of {len(self.accounts)} client(s) not running, launching {k} at a time")
+        k = max(1, int(k))
+        inflight = {}   # uid -> submit time
+        up = 0
+        while (todo or inflight) and not self.stop.is_set():
+            while todo and len(inflight) < k:
+                uid = todo.pop(0)
+                if uid not in self.accounts or self.breaker.hold(uid):
+                    continue
+                inflight[uid] = time.time()
+                self.scheduler.submit(uid, 0)
+            now = time.time()
+            for uid, t in list(inflight.items()):
+                ls = self.launches.get(uid)
+                if ls is not None and ls.started >= t and ls.done.is_set():
+                    del inflight[uid]
+                    if ls.state == LAUNCH_DONE:
+                        up += 1
+                        print(f"[i] Cold start: {uid} up ({up}/{total}, {now - t0:.0f}s)")
+                elif now - t >= timeout:
+                    del inflight[uid]
+                    print(f"[!] Cold start: no heartbeat from {uid} after {timeout}s, moving on")
+            self.stop.wait(0.5)
+        print(f"[✓] Cold start finished: {up}/{total} client(s) up in {time.time() - t0:.0f}s")
+
+    # --- placement: re-applied after every launch (new pids lose it) ---
+    def _place(self, uid, pkg, pids=None):
+        if not self.placement.enabled():
+            return
+        pids = pids or (process_snapshot(PROC_WAIT_TICK).get(pkg) or {}).get("pids")
+        if not pids:
+            return
+        cores = self.placement.cores_for(uid, self.accounts, self._priority)
+        cmd = self.placement.script(pids, cores)
+        if cmd:
+            code, out = root_run(cmd)
+            if code != 0 or out.strip():
+                print(f"[!] Placement of {uid} ({code}): {out.strip()[:200]}")
+
+    def _place_all(self):
+        snap = process_snapshot(0)
+        for uid, info in list(self.accounts.items()):
+            ent = snap.get(info.get("pkg"))
+            if ent:
+                self._place(uid, info["pkg"], ent["pids"])
+
+    def _place_async(self, uid, pkg):
+        if self.placement.enabled():
+            threading.Thread(target=self._place, args=(uid, pkg), daemon=True).start()
+
+    # --- admission: memory headroom + account priority ---
+    def _priority(self, uid):
+        try:
+            return float(self.accounts.get(uid, {}).get("priority", 0) or 0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _admit(self, uid):
+        # runs under the scheduler lock: /proc/meminfo and the last snapshot only (a stale one is fine
+        # for a median; housekeeping refreshes it while rejoins are pending)
+        snap = last_process_snapshot()
+        pkgs = {info.get("pkg") for info in self.accounts.values()}
+        sizes = sorted(e["rss"] for p, e in snap.items() if p in pkgs and e["rss"])
+        need = sizes[len(sizes) // 2] if sizes else 0   # a clone costs about the median running one
+        ok, why = self.admission.check(need)
+        if not ok and self.cfg.get("trim_background", DEFAULT_CONFIG["trim_background"]) \
+                and time.time() - self.last_trim > 60:
+            self.last_trim = time.time()
+            threading.Thread(target=self._trim_background, args=([p for p in snap if p in pkgs],), daemon=True).start()
+        return ok, why
+
+    def _trim_background(self, pkgs):
+        # ask every clone but the focused one to drop caches
+        focus = shout("dumpsys activity activities | grep -m1 -E 'mResumedActivity|topResumedActivity'", root=True) or ""
+        sent = 0
+        for pkg in pkgs:
+            if pkg + "/" in focus:
+                continue
+            sh(f"am send-trim-memory {pkg} RUNNING_LOW", root=True)
+            sent += 1
+        print(f"[i] Sent trim-memory to {sent} background clone(s)")
+
+    def _do_rejoin(self, uid):
+        info = self.accounts.get(uid, {})
+        pkg = info.get("pkg")
+        gid = str(info.get("gid","")).strip()
+        if not pkg:
+            print(f"[!] No pkg for UID {uid}, skip rejoin")
+            return
+        allowed, change = self.breaker.on_attempt(uid)
+        if change:
+            self._breaker_changed(uid, *change)
+        if not allowed:
+            self.scheduler.submit(uid, self.breaker.hold(uid))
+            return
+        self.first_rejoined[uid] = True
+        self.metrics.inc("gpt_rejoins_attempted", (("uid", uid),))
+        ls = LaunchState(uid, pkg)
+        self.launches[uid] = ls
+        self._mark(uid, "dispatch")
+        # stopping -> verify dead
+        print(f"[->] Force-stopping {pkg}")
+        try:
+            sh(f"am force-stop {pkg}", root=True)
+        except Exception:
+            pass
+        self._launch_step(ls, LAUNCH_VERIFY_DEAD)
+        if not self._wait_process(pkg, False, self._launch_timeout(LAUNCH_VERIFY_DEAD)):
+            ent = process_snapshot(0).get(pkg) or {}
+            print(f"[!] {pkg} survived force-stop, killing pids {ent.get('pids')}")
+            if ent.get("pids"):
+                sh("kill -9 " + " ".join(str(p) for p in ent["pids"]), root=True)
+            self._wait_process(pkg, False, 2)
+        else:
+            self._observe(ls, LAUNCH_VERIFY_DEAD)
+        # launching -> wait for the process
+        self._launch_step(ls, LAUNCH_LAUNCHING)
+        self._launch(uid, pkg, gid, prefer_deeplink=True)
+        ls.launched = time.time()
+        self._launch_step(ls, LAUNCH_WAIT_PROCESS)
+        if not self._wait_process(pkg, True, self._launch_timeout(LAUNCH_WAIT_PROCESS)):
+            print(f"[!] {pkg} did not start, retrying via monkey")
+            self._launch(uid, pkg, gid, prefer_deeplink=False)
+            ls.launched = time.time()
+            if not self._wait_process(pkg, True, self._launch_timeout(LAUNCH_WAIT_PROCESS)):
+                self.last_action[uid] = time.time()
+                self._escalate(ls, "process never appeared")
+                return
+        else:
+            self._observe(ls, LAUNCH_WAIT_PROCESS)
+        self._place(uid, pkg)
+        # process is up: the log follower completes the launch on the first RUNNING/INIT_OK
+        ls.deadline = time.time() + self._launch_timeout(LAUNCH_WAIT_HEARTBEAT)
+        self._launch_step(ls, LAUNCH_WAIT_HEARTBEAT)
+        self.deadlines.set(("launch", uid), ls.deadline)
+        self.last_action[uid] = time.time()
+
+    def _launch(self, uid, pkg, gid, prefer_deeplink=True):
+        launched = False
+        # try deep link if gid numeric
+        if prefer_deeplink and gid and any(ch.isdigit() for ch in gid):
+            deep = f"roblox://placeId={gid}"
+            try:
+                rc = sh(f"am start -a android.intent.action.VIEW -d '{deep}'", root=True)
+                if rc == 0:
+                    launched = True
+            except Exception:
+                pass
+        if not launched:
+            print(f"[->] Launching package {pkg} via monkey")
+            try:
+                sh(f"monkey -p {pkg} -c android.intent.category.LAUNCHER 1", root=True)
+            except Exception:
+                pass
+
+    def _wait_process(self, pkg, present, timeout):
+        # poll the shared process snapshot until pkg is (or is no longer) running; every waiter
+        # sleeps until the current snapshot expires, so parallel launches reuse the next scan
+        end = time.time() + timeout
+        while not self.stop.is_set():
+            if bool(process_snapshot(PROC_WAIT_TICK).get(pkg)) == present:
+                return True
+            if time.time() >= end:
+                return False
+            self.stop.wait(max(0.05, _proc_cache["t"] + PROC_WAIT_TICK - time.time()))
+        return False
+
+    def _launch_timeout(self, state):
+        return self.launch_timeouts[state].timeout()
+
+    def _observe(self, ls, state):
+        self.launch_timeouts[state].observe(time.time() - ls.since)
+
+    _STATE_MARKS = {LAUNCH_LAUNCHING: "stop", LAUNCH_WAIT_PROCESS: "launch",
+                    LAUNCH_WAIT_HEARTBEAT: "proc", LAUNCH_DONE: "heartbeat"}
+
+    def _launch_step(self, ls, state, reason=""):
+        ls.set(state, reason)
+        mark = self._STATE_MARKS.get(state)
+        if mark:
+            self._mark(ls.uid, mark)
+        if state == LAUNCH_DONE:
+            self.metrics.inc("gpt_rejoins_succeeded", (("uid", ls.uid),))
+            self._close_incident(ls.uid)
+        elif state == LAUNCH_ESCALATE:
+            self.metrics.inc("gpt_rejoins_failed", (("uid", ls.uid),))
+            if self.events:
+                inc = self.incidents.get(ls.uid) or {}
+                self.events.add("launch", ls.uid, time.time(), state, self._cause_code(inc), None, reason,
+                                round(time.time() - ls.started, 3))
+
+    def _mark(self, uid, name):
+        inc = self.incidents.get(uid)
+        if inc is not None:
+            inc[name] = time.time()
+            if name == "dispatch":
+                inc["attempts"] += 1
+
+    def _close_incident(self, uid):
+        inc = self.incidents.pop(uid, None)
+        if inc is None:
+            return
+        d = self.latency.add_incident(uid, inc)
+        if self.events:
+            self.events.add("launch", uid, time.time(), LAUNCH_DONE, self._cause_code(inc), None,
+                            f"{inc['attempts']} attempt(s)", round(d["total"], 3) if "total" in d else None)
+        if "total" in d:
+            print(f"[i] {uid} incident ({inc.get('cause') or 'stale'}): offline {d['total']:.1f}s, "
+                  f"{inc['attempts']} attempt(s)")
+
+    @staticmethod
+    def _cause_code(inc):
+        ev, _, code = (inc.get("cause") or "").partition("/")
+        return code or ev or None
+
+    def _escalate(self, ls, reason):
+        self._launch_step(ls, LAUNCH_ESCALATE, reason)
+        print(f"[!] Launch of {ls.uid} ({ls.pkg}) failed: {reason} -> rescheduling")
+        self.scheduler.submit(ls.uid, self._jitter())
+
+    def _breaker_changed(self, uid, old, new):
+        user = self.accounts.get(uid, {}).get("username", "")
+        hold = self.breaker.hold(uid)
+        if new == BREAKER_OPEN:
+            text = f"{uid} ({user}) keeps failing to stay in game; relaunches paused for {_fmt_secs(math.ceil(hold))}"
+            print(f"[!] Circuit open: {text}")
+        elif new == BREAKER_HALF_OPEN:
+            text = f"{uid} ({user}) probe relaunch"
+            print(f"[i] Circuit half-open: {text}")
+        else:
+            text = f"{uid} ({user}) stayed up after the probe; relaunches resumed"
+            print(f"[✓] Circuit closed: {text}")
+        self.metrics.inc("gpt_breaker_transitions", (("uid", uid), ("to", new)))
+        if self.events:
+            self.events.add("breaker", uid, time.time(), new, None, None, f"{old} -> {new}", round(hold, 1) or None)
+        if new != BREAKER_HALF_OPEN:
+            send_alert_async(f"🔌 Circuit {new}: {uid}", text, self.cfg,
+                             0xe74c3c if new == BREAKER_OPEN else 0x2ecc71)
+
+    def _on_heartbeat(self, uid, rec):
+        # first RUNNING/INIT_OK after a relaunch completes the launch
+        ls = self.launches.get(uid)
+        if ls is None or ls.state != LAUNCH_WAIT_HEARTBEAT:
+            return
+        if ls.launched is not None and int(rec.get("t", 0)) + 1 < ls.launched:
+            return   # written by the previous instance
+        self.deadlines.cancel(("launch", uid))
+        self._observe(ls, LAUNCH_WAIT_HEARTBEAT)
+        self._launch_step(ls, LAUNCH_DONE)
+        print(f"[✓] {uid} back online after {time.time() - ls.started:.1f}s")
+        # the game has spawned its worker threads by now
+        self._place_async(uid, ls.pkg)
+
+    def _on_deadline(self, key, deadline):
+        if isinstance(key, tuple):
+            ls = self.launches.get(key[1])
+            if ls is not None and ls.state == LAUNCH_WAIT_HEARTBEAT:
+                self._escalate(ls, f"no heartbeat within {deadline - ls.since:.0f}s")
+        else:
+            self._on_stale(key, deadline)
+
+    def _worker_loop(self):
+        while not self.stop.is_set():
+            try:
+                uid, ln = self.q.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._handle_line_safe(uid, ln)
+        # lines already read past the checkpointed offset must not be lost
+        while True:
+            try:
+                uid, ln = self.q.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_line_safe(uid, ln)
+        print("[i] Worker loop stopped")
+
+    def _handle_line_safe(self, uid, ln):
+        # one bad record (or a failing side effect) must not stop the only worker
+        try:
+            self._handle_line(uid, ln)
+        except Exception as e:
+            print(f"[!] worker error for {uid}: {e}")
+
+    def _handle_line(self, uid, ln):
+        rec = self._parse_line(ln)
+        if not rec:
+            return
+        self.metrics.inc("gpt_records_parsed", (("uid", uid),))
+        # update last seen
+        t = int(rec.get("t", time.time()))
+        if self.events:
+            d = rec.get("details")
+            msg = d.get("msg") if isinstance(d, dict) else None
+            self.events.add("record", uid, t, rec.get("event"), rec.get("code"), rec.get("severity"),
+                            str(msg)[:200] if msg else None)
+        self.last_seen[uid] = t
+        # replayed backlog carries old timestamps; never arm a deadline that is already due
+        self.deadlines.set(uid, max(t, time.time()) + self.heartbeat_stale)
+        if rec.get("event") == "RUNNING":
+            d = rec.get("details")
+            if isinstance(d, dict) and d.get("fps") is not None:
+                self.fps[uid] = d["fps"]
+            self._on_heartbeat(uid, rec)
+            change = self.breaker.on_running(uid, t)
+            if change:
+                self._breaker_changed(uid, *change)
+        # severity rules -> rejoin now / rejoin delayed / alert; ignore covers minor/running
+        verdict = self.rules.classify(rec)
+        action = verdict["action"]
+        if action == "ignore":
+            return
+        if t < self.last_action.get(uid, 0):
+            # happened before the last rejoin (replay after restart, or our own force-stop)
+            return
+        self.metrics.inc("gpt_rule_matches", (("rule", verdict["name"]), ("action", action)))
+        if action == "alert":
+            d = rec.get("details")
+            msg = d.get("msg") if isinstance(d, dict) else None
+            print(f"[!] Alert rule {verdict['name']} for {uid}: {rec.get('event')} / {rec.get('code')}")
+            send_alert_async(f"⚠️ {uid}: {rec.get('event')} / {rec.get('code')}",
+                             f"rule `{verdict['name']}`" + (f": {str(msg)[:500]}" if msg else ""), self.cfg)
+            return
+        # only schedule rejoin, do not send webhook here (per your request)
+        self.metrics.inc("gpt_severe_events", (("code", rec.get("code") or rec.get("event") or ""),))
+        print(f"[!] SEVERE detected for {uid}: {rec.get('event')} / {rec.get('code')} (rule {verdict['name']})")
+        self._schedule_rejoin(uid, event_t=t, cause=f"{rec.get('event')}/{rec.get('code')}",
+                              extra=verdict["delay"] if action == "rejoin_delayed" else 0)
+
+    def _on_stale(self, uid, deadline=None):
+        # fired by the deadline timer when uid's last heartbeat is heartbeat_stale old
+        if uid not in self.accounts:
+            return
+        now = time.time()
+        # relaunch in flight: the launch's own heartbeat deadline escalates a boot that never reports
+        ls = self.launches.get(uid)
+        if ls is not None and not ls.done.is_set():
+            self.deadlines.set(uid, max(ls.deadline or 0, now) + self.heartbeat_stale)
+            return
+        # a heartbeat may have landed after this deadline was armed
+        seen = self.last_seen.get(uid, 0)
+        if now - seen < self.heartbeat_stale:
+            self.deadlines.set(uid, seen + self.heartbeat_stale)
+            return
+        # cooldown check
+        if now - self.last_action.get(uid, 0) < self.rejoin_cooldown:
+            self.deadlines.set(uid, self.last_action.get(uid, 0) + self.rejoin_cooldown)
+            return
+        print(f"[!] Heartbeat stale for {uid} -> scheduling rejoin")
+        self._schedule_rejoin(uid, event_t=deadline, cause="HEARTBEAT_STALE")
+        self.last_action[uid] = now
+        # keep checking while it stays silent
+        self.deadlines.set(uid, now + self.rejoin_cooldown)
+
+    def _periodic_webhook_loop(self):
+        # run first immediately
+        cfg = load_config()
+        interval_s = int(cfg.get("report_interval_min", DEFAULT_CONFIG["report_interval_min"])) * 60
+        if interval_s <= 0:
+            return
+        psutil = optional_import("psutil")
+        if psutil:
+            psutil.cpu_percent(interval=None)   # prime non-blocking CPU measurement
+        # small initial delay to avoid sending immediately on start if undesired
+        time.sleep(2)
+        while not self.stop.is_set():
+            try:
+                send_status_webhook(cfg, monitor=self)
+            except Exception as e:
+                print("[!] periodic webhook error:", e)
+            # sleep interval
+            for _ in range(int(interval_s)):
+                if self.stop.is_set(): break
+                time.sleep(1)
+
+    def stop_all(self):
+        self.stop.set()
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+        ACCOUNTS_STORE.unsubscribe(self._on_accounts_changed)
+        RULES_STORE.unsubscribe(self._on_rules_changed)
+        # follower first (no new lines), then worker drains the queue, then checkpoint
+        self.follower.thread.join(3)
+        self.worker_t.join(3)
+        self.save_state()
+        if self.events:
+            self.events.close()
+
+# --- Daemon: JSON-line control socket (one request, one reply per connection) ---
+def _ctl_status(mon, args):
+    snap = process_snapshot()
+    pending = mon.scheduler.pending_snapshot()
+    breaker = mon.breaker.states()
+    now = time.time()
+    accounts = {}
+    for uid, info in mon.accounts.items():
+        ls = mon.launches.get(uid)
+        seen = mon.last_seen.get(uid)
+        accounts[uid] = {
+            "username": info.get("username", ""), "pkg": info.get("pkg", ""),
+            "running": info.get("pkg") in snap,
+            "last_seen_s": None if seen is None else int(now - seen),
+            "fps": mon.fps.get(uid),
+            "launch": ls.state if ls else None,
+            "rejoin_in_s": round(pending[uid] - now, 1) if uid in pending else None,
+            "breaker": breaker.get(uid, BREAKER_CLOSED),
+        }
+    return {"pid": os.getpid(), "uptime_s": int(now - mon.started), "queue": mon.q.qsize(),
+            "pending": len(pending), "held": mon.scheduler.held_count(), "accounts": accounts}
+
+def _ctl_add_account(mon, args):
+    pkg = str(args.get("pkg") or "").strip()
+    if not pkg:
+        raise ValueError("pkg is required")
+    uid = str(args.get("uid") or "").strip()
+    uname = args.get("username")
+    if not uid:
+        uname2, uid = read_user_from_appStorage(pkg)
+        uname = uname or uname2
+        if not uid:
+            raise ValueError(f"could not read UserID from {pkg} appStorage; pass uid")
+    accounts = load_accounts()
+    entry = accounts.get(uid, {})
+    entry.update({"username": uname or entry.get("username") or "unknown", "pkg": pkg,
+                  "gid": str(args.get("gid", entry.get("gid", "")))})
+    if args.get("priority") is not None:
+        entry["priority"] = float(args["priority"])
+    accounts[uid] = entry
+    save_accounts(accounts)   # the monitor picks it up through the accounts store
+    return {"uid": uid, "account": entry}
+
+def _ctl_rejoin(mon, args):
+    uid = str(args.get("uid") or "")
+    if uid not in mon.accounts:
+        raise ValueError(f"unknown uid {uid!r}")
+    return {"uid": uid, "queued": mon.scheduler.submit(uid, 0)}
+
+def _ctl_reload(mon, args):
+    ACCOUNTS_STORE.poll()
+    RULES_STORE.poll()
+    mon.reload_config(load_config())
+    return {"accounts": len(mon.accounts), "rules": mon.rules.version}
+
+def _ctl_report_now(mon, args):
+    # screenshot + snapshot take a moment: reply first, build the report on a thread
+    threading.Thread(target=send_status_webhook, args=(mon.cfg, mon), daemon=True).start()
+    return {"queued": bool(mon.cfg.get("webhook_url", "").strip())}
+
+def _ctl_stop(mon, args):
+    mon.stop.set()
+    return {"stopping": True}
+
+CONTROL_COMMANDS = {
+    "ping": lambda mon, args: {"pid": os.getpid()},
+    "status": _ctl_status,
+    "add-account": _ctl_add_account,
+    "rejoin": _ctl_rejoin,
+    "reload": _ctl_reload,
+    "report-now": _ctl_report_now,
+    "stop": _ctl_stop,
+}
+
+def start_control_server(mon, path=None):
+    import socketserver
+    path = path or CONTROL_SOCKET
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                req = json.loads(self.rfile.readline(65536) or b"{}")
+                fn = CONTROL_COMMANDS.get(req.get("cmd"))
+                if fn is None:
+                    raise ValueError(f"unknown command {req.get('cmd')!r}")
+                res = {"ok": True, "result": fn(mon, req.get("args") or {})}
+            except Exception as e:
+                res = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(res, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    if os.path.exists(path):
+        os.unlink(path)   # stale: callers check for a live daemon first
+    old = os.umask(0o177)
+    try:
+        srv = socketserver.ThreadingUnixStreamServer(path, Handler)
+    finally:
+        os.umask(old)
+    srv.daemon_threads = True
+    threading.Thread(target=srv.serve_forever, name="control", daemon=True).start()
+    return srv
+
+def control_request(cmd, args=None, path=None, timeout=15):
+    # -> reply dict, or None when no daemon is listening
+    import socket
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    try:
+        s.connect(path or CONTROL_SOCKET)
+        s.sendall(json.dumps({"cmd": cmd, "args": args or {}}).encode("utf-8") + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+        return json.loads(buf)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    finally:
+        s.close()
+
+def _daemonize(log_path):
+    # classic double fork; called before any thread exists
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+    ensure_dir(os.path.dirname(log_path))
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    sys.stdout = os.fdopen(1, "w", buffering=1)
+    sys.stderr = os.fdopen(2, "w", buffering=1)
+
+def run_daemon(detach=False):
+    import signal
+    if control_request("ping", timeout=2):
+        print(f"[!] Daemon already running ({CONTROL_SOCKET})")
+        return 1
+    if detach:
+        print(f"[i] Detaching; log in {DAEMON_LOG}")
+        _daemonize(DAEMON_LOG)
+    ensure_dir(WORKDIR)
+    cfg = load_config()
+    install_lua(cfg=cfg)
+    print(f"[i] Starting Auto Rejoin daemon (pid {os.getpid()}) ...")
+    mon = RejoinMonitor(cfg)
+    srv = start_control_server(mon)
+    print(f"[i] Control socket {CONTROL_SOCKET}")
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(sig, lambda *_a: mon.stop.set())
+    try:
+        while not mon.stop.wait(1):
+            pass
+    finally:
+        print("[i] Stopping daemon...")
+        srv.shutdown()
+        srv.server_close()
+        try:
+            os.unlink(CONTROL_SOCKET)
+        except OSError:
+            pass
+        mon.stop_all()
+    return 0
+
+# --- Menu / UI functions ---
+def choose_package_prefix(cfg):
+    cur = cfg.get("package_prefix", DEFAULT_CONFIG["package_prefix"])
+    new = input(f"Package prefix (current: {cur}) >> ").strip()
+    if new:
+        cfg["package_prefix"] = new
+        save_config(cfg)
+        print("[✓] Prefix updated.")
+
+def add_account_interactive(cfg):
+    # list third-party packages
+    pkgs = []
+    out = shout("pm list packages -3")
+    for ln in out.splitlines():
+        ln = ln.strip()
+        if ln.startswith("package:"):
+            pkgs.append(ln.split("package:")[-1])
+    if not pkgs:
+        print("[!] No third-party packages found.")
+        return
+    # show packages
+    print("Found packages:")
+    for i, p in enumerate(pkgs, 1):
+        print(f"{i:3d}. {p}")
+    s = input("Choose package number >> ").strip()
+    try:
+        idx = int(s) - 1
+        pkg = pkgs[idx]
+    except Exception:
+        print("Invalid choice.")
+        return
+    uname, uid = read_user_from_appStorage(pkg)
+    if not uid:
+        print("[!] Could not read UserID from appStorage. You can type UserID manually.")
+        uid = input("Enter UserID (blank to cancel) >> ").strip()
+        if not uid:
+            print("Cancelled.")
+            return
+    gid = input("Enter GameID (placeId) or leave blank >> ").strip()
+    accounts = load_accounts()
+    accounts[uid] = {"username": uname or "unknown", "pkg": pkg, "gid": gid}
+    save_accounts(accounts)
+    print(f"[+] Added UID {uid} -> pkg {pkg}")
+
+def auto_scan_packages(cfg):
+    pref = cfg.get("package_prefix", DEFAULT_CONFIG["package_prefix"])
+    print(f"[i] Scanning packages by prefix {pref} ...")
+    pkgs = []
+    out = shout("pm list packages -3")
+    for ln in out.splitlines():
+        ln = ln.strip()
+        if ln.startswith("package:"):
+            p = ln.split("package:")[-1]
+            if p.startswith(pref):
+                pkgs.append(p)
+    if not pkgs:
+        print("[!] No packages found with that prefix.")
+        return
+    accounts = load_accounts()
+    for p in pkgs:
+        uname, uid = read_user_from_appStorage(p)
+        if not uid:
+            print(f"Skip {p} (no uid read).")
+            continue
+        gid = input(f"GameID for {p} (user {uname} uid {uid}) >> ").strip()
+        accounts[uid] = {"username": uname or "unknown", "pkg": p, "gid": gid}
+    save_accounts(accounts)
+
+def list_accounts():
+    acc = load_accounts()
+    if not acc:
+        print("No accounts configured.")
+    else:
+        for i, (uid, info) in enumerate(acc.items(), 1):
+            print(f"{i:2d}. UID={uid} user={info.get('username')} pkg={info.get('pkg')} gid={info.get('gid')}")
+    input("Enter to continue...")
+
+def configure_webhook_menu(cfg):
+    print("[Webhook / Device config]")
+    url = input(f"Webhook URL (current: {cfg.get('webhook_url','')}) >> ").strip()
+    if url:
+        cfg['webhook_url'] = url
+    dev = input(f"Device name (current: {cfg.get('device_name')}) >> ").strip()
+    if dev:
+        cfg['device_name'] = dev
+    try:
+        mins = input(f"Report interval minutes (current: {cfg.get('report_interval_min')}) >> ").strip()
+        if mins != "":
+            cfg['report_interval_min'] = int(mins)
+    except Exception:
+        pass
+    # icon is fixed by default; allow change
+    ic = input(f"Icon URL (current: {cfg.get('icon_url')}) >> ").strip()
+    if ic:
+        cfg['icon_url'] = ic
+    # screenshot toggle
+    ss = input(f"Send screenshot? (y/N) (current: {cfg.get('send_screenshot')} ) >> ").strip().lower()
+    if ss == "y":
+        cfg['send_screenshot'] = True
+    elif ss == "n":
+        cfg['send_screenshot'] = False
+    # save
+    save_config(cfg)
+    print("[✓] Webhook config saved.")
+
+def set_android_id_menu():
+    aid = input("Enter Android ID to set (blank to cancel) >> ").strip()
+    if not aid:
+        print("Cancelled.")
+        return
+    rc = sh(f"settings put secure android_id {aid}", root=True)
+    if rc == 0:
+        print("[✓] Android ID set.")
+    else:
+        print("[!] Failed to set Android ID (need root?)")
+
+def install_lua_menu(cfg):
+    print("[i] Installing Lua autoexec to autoexec directories...")
+    written = install_lua(cfg=cfg)
+    if written:
+        for p in written:
+            print("[✓] Wrote", p)
+    else:
+        print("[!] No autoexec written. Check paths/permissions.")
+    print("[i] Ensure your executor loads the autoexec on game start.")
+
+def start_auto_rejoin(cfg):
+    if control_request("ping", timeout=2):
+        print(f"[!] The auto rejoin daemon is already running ({CONTROL_SOCKET}); use 'status' / 'stop'.")
+        input("Enter to continue...")
+        return
+    # install lua first
+    install_lua(cfg=cfg)
+    print("[i] Starting Auto Rejoin Monitor ...")
+    mon = RejoinMonitor(cfg)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("[i] Stopping monitor...")
+        mon.stop_all()
+        time.sleep(1)
+
+# --- Main menu ---
+def main_menu():
+    ensure_dir(WORKDIR)
+    cfg = load_config()
+    # write default config if missing
+    if not os.path.exists(CONFIG_FILE):
+        save_config(cfg)
+    while True:
+        os.system("clear")
+        print("+{:-^78}+".format(""))
+        print("|{:^78}|".format("GPT-Tool Termux — Auto Rejoin + Webhook"))
+        print("+{:-^78}+".format(""))
+        print()
+        print("1) Start Auto Rejoin")
+        print("2) Install/Update Lua autoexec only")
+        print("3) Add account")
+        print("4) Auto add account")
+        print("5) List accounts")
+        print("6) Configure package prefix")
+        print("7) Configure Webhook / Device / Interval")
+        print("8) Set Android ID")
+        print("9) Send one manual status report now")
+        print("10) Event history (kicks / top error codes)")
+        print("0) Exit")
+        c = input("\nChoice >> ").strip()
+        if c == "1":
+            cfg = load_config()
+            start_auto_rejoin(cfg)
+        elif c == "2":
+            install_lua_menu(load_config())
+            input("Enter to continue...")
+        elif c == "3":
+            add_account_interactive(load_config())
+            input("Enter to continue...")
+        elif c == "4":
+            auto_scan_packages(load_config())
+            input("Enter to continue...")
+        elif c == "5":
+            list_accounts()
+        elif c == "6":
+            choose_package_prefix(load_config())
+            input("Enter to continue...")
+        elif c == "7":
+            configure_webhook_menu(load_config())
+            input("Enter to continue...")
+        elif c == "8":
+            set_android_id_menu()
+            input("Enter to continue...")
+        elif c == "9":
+            if send_status_webhook(load_config()):
+                print("[i] Report queued, delivering ...")
+                if get_delivery().flush(30):
+                    print("[✓] Report delivered.")
+                else:
+                    print(f"[!] Not delivered yet; it stays queued in {OUTBOX_DIR}")
+            input("Enter to continue...")
+        elif c == "10":
+            print_event_report()
+            input("Enter to continue...")
+        elif c == "0":
+            print("Bye.")
+            break
+        else:
+            print("Invalid choice.")
+            time.sleep(0.7)
+
+# --- CLI subcommands ---
+def cmd_events(args):
+    # events [hours] [limit]
+    hours = float(args[0]) if args else 24
+    limit = int(args[1]) if len(args) > 1 else 10
+    print_event_report(hours, limit)
+    return 0
+
+def cmd_rules(args):
+    # rules [--lua]: validate rules.json and show what it compiles to
+    try:
+        data = RULES_STORE.get()
+        if RULES_STORE.error:
+            raise ValueError(RULES_STORE.error)
+        rules = RuleSet(data or DEFAULT_RULES)
+    except ValueError as e:
+        print(f"[!] {RULES_FILE}: {e}")
+        return 1
+    if "--lua" in args:
+        print(rules.to_lua())
+        return 0
+    print(f"[i] {RULES_FILE}: {len(rules.rules)} rule(s), version {rules.version}, default {rules.default['action']}")
+    for r in rules.rules:
+        match = [f"{k}={'|'.join(r[k])}" for k in ("event", "severity") if r[k]]
+        if r["code"]:
+            match.append(f"code={r['code']}*")
+        if r["code_has"]:
+            match.append(f"code=*{r['code_has']}*")
+        if r["code_re"]:
+            match.append(f"code~{r['code_re']}")
+        if r["msg"]:
+            match.append(f"{'prompt' if r['code'] else 'msg'}={'|'.join(r['msg'])}")
+        action = r["action"] + (f" +{r['delay']:g}s" if r["action"] == "rejoin_delayed" else "")
+        print(f"{r['idx']:>3} {r['name']:<22} {action:<20} {' '.join(match) or '*'}")
+    return 0
+
+def cmd_help(args):
+    print("usage: GPT-Tool-v2.py [command] [args]   (no command opens the menu)")
+    print("commands: " + ", ".join(sorted(CLI_COMMANDS)))
+    print("dev tools (simulate, bench, bench-format, bench-startup): python tools/gpt_dev.py <command>")
+    return 0
+
+def _ctl(cmd, args=None):
+    res = control_request(cmd, args)
+    if res is None:
+        print(f"[!] Daemon not running ({CONTROL_SOCKET}); start it with: daemon --detach")
+        return None
+    if not res.get("ok"):
+        print(f"[!] {cmd}: {res.get('error')}")
+        return None
+    return res["result"]
+
+def cmd_daemon(args):
+    return run_daemon(detach="--detach" in args or "-d" in args)
+
+def cmd_status(args):
+    res = _ctl("status")
+    if res is None:
+        return 1
+    if "--json" in args:
+        print(json.dumps(res, indent=2))
+        return 0
+    print(f"pid {res['pid']}  up {_fmt_secs(res['uptime_s'])}  queue {res['queue']}  "
+          f"pending {res['pending']}  held {res['held']}")
+    print(f"{'uid':<14} {'user':<16} {'run':<4} {'seen':>6} {'fps':>4} {'launch':<15} {'breaker':<9} rejoin")
+    for uid, a in res["accounts"].items():
+        seen = "-" if a["last_seen_s"] is None else f"{a['last_seen_s']}s"
+        rj = "" if a["rejoin_in_s"] is None else f"in {a['rejoin_in_s']}s"
+        print(f"{uid:<14} {a['username'][:16]:<16} {'yes' if a['running'] else 'no':<4} {seen:>6} "
+              f"{'' if a['fps'] is None else a['fps']:>4} {a['launch'] or '-':<15} {a['breaker']:<9} {rj}")
+    return 0
+
+def cmd_add_account(args):
+    # add-account <pkg> [uid] [gid] [priority]
+    if not args:
+        print("usage: add-account <pkg> [uid] [gid] [priority]")
+        return 2
+    keys = ("pkg", "uid", "gid", "priority")
+    res = _ctl("add-account", dict(zip(keys, args)))
+    if res is None:
+        return 1
+    print(f"[+] Added UID {res['uid']} -> pkg {res['account']['pkg']}")
+    return 0
+
+def cmd_rejoin(args):
+    if not args:
+        print("usage: rejoin <uid>")
+        return 2
+    res = _ctl("rejoin", {"uid": args[0]})
+    if res is None:
+        return 1
+    print(f"[->] Rejoin {res['uid']} queued" if res["queued"] else f"[i] Rejoin {res['uid']} already pending")
+    return 0
+
+def cmd_reload(args):
+    res = _ctl("reload")
+    if res is None:
+        return 1
+    print(f"[✓] Reloaded ({res['accounts']} accounts)")
+    return 0
+
+def cmd_report_now(args):
+    res = _ctl("report-now")
+    if res is None:
+        return 1
+    print("[✓] Report queued" if res["queued"] else "[!] No webhook configured")
+    return 0
+
+def cmd_stop(args):
+    if _ctl("stop") is None:
+        return 1
+    print("[✓] Daemon stopping")
+    return 0
+
+CLI_COMMANDS = {
+    "help": cmd_help,
+    "rules": cmd_rules,
+    "events": cmd_events,
+    "daemon": cmd_daemon,
+    "status": cmd_status,
+    "add-account": cmd_add_account,
+    "rejoin": cmd_rejoin,
+    "reload": cmd_reload,
+    "report-now": cmd_report_now,
+    "stop": cmd_stop,
+}
+
+def run_cli(argv):
+    fn = CLI_COMMANDS.get(argv[0])
+    if fn is None:
+        print(f"Unknown command {argv[0]!r}. Commands: {', '.join(sorted(CLI_COMMANDS))}")
+        return 2
+    return fn(argv[1:]) or 0
+
+# --- Entry point (GPT-Tool-v2.py is a launcher for this module, so its bytecode gets cached) ---
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        sys.exit(run_cli(argv))
+    # main_menu creates WORKDIR / default config only when they are missing
+    print("GPT-Tool Termux ready. Opening menu...")
+    main_menu()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,760 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# GPT-Tool dev tooling (not needed on devices): python tools/gpt_dev.py <command> [args]
+import os, sys, time, json, threading, subprocess, struct
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+import gpt_tool as gt
+
+# --- Simulation: fake su/am/monkey/ps/screencap on PATH, synthetic status logs, webhook sink ---
+SIM_SHIM_COMMON = r'''#!/bin/sh
+echo "$(date +%s.%N) $(basename "$0") $*" >> "$GPT_SIM_DIR/calls.log"
+launch() {
+  pidf="$GPT_SIM_DIR/run/$1.pid"
+  if [ -f "$pidf" ] && kill -0 "$(cat "$pidf")" 2>/dev/null; then return 0; fi
+  "$GPT_SIM_PY" -c 'import os, sys; os.execvp("sleep", [sys.argv[1], "86400"])' "$1" </dev/null >/dev/null 2>&1 &
+  echo $! > "$pidf"
+}
+stop() {
+  pidf="$GPT_SIM_DIR/run/$1.pid"
+  [ -f "$pidf" ] && kill "$(cat "$pidf")" 2>/dev/null
+  rm -f "$pidf"
+}
+'''
+
+SIM_SHIMS = {
+    "su": r'''
+if [ "$1" = "-c" ]; then shift; exec sh -c "$*"; fi
+exec sh
+''',
+    "am": r'''
+case "$1" in
+  force-stop) stop "$2" ;;
+  start)
+    pkg=""
+    while [ $# -gt 0 ]; do
+      case "$1" in -p) pkg="$2"; shift ;; -n) pkg="${2%%/*}"; shift ;; esac
+      shift
+    done
+    [ -n "$pkg" ] && launch "$pkg" ;;
+esac
+exit 0
+''',
+    "monkey": r'''
+[ "$1" = "-p" ] && launch "$2"
+exit 0
+''',
+    "ps": r'''
+echo "PID RSS NAME"
+for f in "$GPT_SIM_DIR"/run/*.pid; do
+  [ -f "$f" ] && echo "$(cat "$f") 250000 $(basename "$f" .pid)"
+done
+''',
+    "screencap": r'''
+if [ "$1" = "-p" ]; then
+  if [ -n "$2" ]; then cat "$GPT_SIM_DIR/screen.png" > "$2"; else cat "$GPT_SIM_DIR/screen.png"; fi
+else
+  cat "$GPT_SIM_DIR/screen.raw"
+fi
+''',
+}
+
+def sim_install_shims(sim_dir):
+    # stub executables + fake screen; PATH / env are set for this process and its children
+    bin_dir = os.path.join(sim_dir, "bin")
+    gt.ensure_dir(bin_dir)
+    gt.ensure_dir(os.path.join(sim_dir, "run"))
+    for name, body in SIM_SHIMS.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, "w") as f:
+            f.write(SIM_SHIM_COMMON + body)
+        os.chmod(path, 0o755)
+    w, h = 72, 128
+    with open(os.path.join(sim_dir, "screen.raw"), "wb") as f:
+        f.write(struct.pack("<III", w, h, 1) + bytes([40, 40, 40, 255]) * (w * h))
+    Image = gt.optional_import("PIL.Image")
+    if Image is not None:
+        Image.new("RGB", (w, h), (40, 40, 40)).save(os.path.join(sim_dir, "screen.png"))
+    os.environ["GPT_SIM_DIR"] = sim_dir
+    os.environ["GPT_SIM_PY"] = sys.executable
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+
+SIM_WORKDIR_FILES = {
+    "CONFIG_FILE": "configs.json", "ACCOUNTS_FILE": "accounts.json", "TELEMETRY_FILE": "telemetry.jsonl",
+    "OUTBOX_DIR": "outbox", "STATE_FILE": "monitor_state.json", "LATENCY_FILE": "latency.json",
+    "EVENTS_DB": "events.db", "DAEMON_LOG": "daemon.log", "RULES_FILE": "rules.json",
+}
+
+def sim_set_workdir(path):
+    # repoint every gpt_tool WORKDIR file and drop its cached pools; call before starting a monitor
+    gt.WORKDIR = path
+    for name, fname in SIM_WORKDIR_FILES.items():
+        setattr(gt, name, os.path.join(path, fname))
+    gt.CONFIG_STORE = gt.JsonStore(gt.CONFIG_FILE)
+    gt.ACCOUNTS_STORE = gt.JsonStore(gt.ACCOUNTS_FILE)
+    gt.RULES_STORE = gt.JsonStore(gt.RULES_FILE)
+    with gt._root_pool_lock:
+        if gt._root_pool:
+            gt._root_pool.close()
+        gt._root_pool = None
+    with gt._delivery_lock:
+        gt._delivery = None
+    gt.ensure_dir(path)
+
+def sim_spawn(sim_dir, pkg):
+    # a fake clone: `sleep` whose argv[0] is the package name, as the /proc scan sees it
+    p = subprocess.Popen([pkg, "86400"], executable="sleep", stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(os.path.join(sim_dir, "run", pkg + ".pid"), "w") as f:
+        f.write(str(p.pid))
+    return p
+
+def sim_kill_all(sim_dir):
+    run = os.path.join(sim_dir, "run")
+    for name in os.listdir(run):
+        try:
+            with open(os.path.join(run, name)) as f:
+                os.kill(int(f.read().strip()), 9)
+        except Exception:
+            pass
+        os.unlink(os.path.join(run, name))
+
+def sim_calls(sim_dir):
+    counts = {}
+    try:
+        with open(os.path.join(sim_dir, "calls.log")) as f:
+            for ln in f:
+                parts = ln.split(None, 3)
+                if len(parts) >= 2:
+                    counts[parts[1]] = counts.get(parts[1], 0) + 1
+    except OSError:
+        pass
+    return counts
+
+class SimWebhookSink:
+    def __init__(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        sink = self
+        self.posts = 0
+        self.bytes = 0
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                n = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(n)
+                sink.posts += 1
+                sink.bytes += n
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.srv.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.srv.server_port}/webhook"
+        threading.Thread(target=self.srv.serve_forever, name="sim-sink", daemon=True).start()
+
+    def close(self):
+        self.srv.shutdown()
+        self.srv.server_close()
+
+class SimClient:
+    __slots__ = ("uid", "pkg", "log", "pid", "pid_mtime", "state", "next_t", "fault_t", "launch_t")
+
+    def __init__(self, uid, pkg, log):
+        self.uid, self.pkg, self.log = uid, pkg, log
+        self.pid = None
+        self.pid_mtime = 0
+        self.state = "up"      # up / booting / failed (severe written) / hung (silent) / dead (no process)
+        self.next_t = 0.0
+        self.fault_t = None    # when the current failure was injected
+        self.launch_t = None
+
+class SimWriter:
+    # synthetic status_<uid>.log traffic: heartbeats, 277/268 errors, kicks, minor GUI errors, silent hangs
+    SEVERE = (("ERROR", "ERROR_277", "SEVERE"), ("ERROR", "ERROR_268", "SEVERE"), ("KICK", "PLAYER_REMOVED", "SEVERE"))
+
+    def __init__(self, sim_dir, clients, fmt="json", interval=5.0, error_rate=0.01, stale_rate=0.002,
+                 minor_rate=0.02, boot=3.0, seed=1):
+        import random
+        self.rng = random.Random(seed)
+        self.sim_dir = sim_dir
+        self.clients = clients
+        self.fmt = fmt
+        self.interval = interval
+        self.error_rate, self.stale_rate, self.minor_rate = error_rate, stale_rate, minor_rate
+        self.boot = boot
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.injected = {}     # uid -> (kind, time) of the open fault, read by the monitor hook
+        self.stats = {"records": 0, "severe": 0, "stale": 0, "minor": 0, "heals": []}
+        self.cpu = 0.0
+        self.thread = threading.Thread(target=self._loop, name="sim-writer", daemon=True)
+
+    def start(self):
+        now = time.time()
+        for c in self.clients:
+            c.next_t = now + self.rng.uniform(0, self.interval)
+            self._check_pid(c)
+        self.thread.start()
+
+    def _write(self, c, event, code, severity, details=None):
+        ln = gt.format_status_line(self.fmt, time.time(), event, code, severity, details, c.uid, "sim")
+        with open(c.log, "a") as f:
+            f.write(ln + "\n")
+        self.stats["records"] += 1
+
+    def _check_pid(self, c):
+        pidf = os.path.join(self.sim_dir, "run", c.pkg + ".pid")
+        try:
+            st = os.stat(pidf)
+        except OSError:
+            c.pid = None
+            if c.state != "dead":
+                c.state = "dead"
+            return
+        if st.st_mtime_ns == c.pid_mtime:
+            return
+        c.pid_mtime = st.st_mtime_ns
+        try:
+            with open(pidf) as f:
+                pid = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return
+        if pid != c.pid:
+            if c.pid is not None or c.state == "dead":
+                c.state, c.launch_t = "booting", time.time()
+                c.next_t = time.time() + self.boot
+            c.pid = pid
+
+    def _tick(self, c, now):
+        self._check_pid(c)
+        if now < c.next_t or c.state in ("dead", "failed", "hung"):
+            return
+        if c.state == "booting":
+            self._write(c, "RUNNING", "INIT_OK", "INFO")
+            if c.fault_t is not None:
+                self.stats["heals"].append(now - c.fault_t)
+                c.fault_t = None
+            c.state = "up"
+            c.next_t = now + self.interval
+            return
+        r = self.rng.random()
+        if r < self.error_rate:
+            event, code, sev = self.rng.choice(self.SEVERE)
+            with self.lock:
+                self.injected[c.uid] = ("severe", time.time())
+            self._write(c, event, code, sev, {"msg": "simulated"})
+            self.stats["severe"] += 1
+            c.state, c.fault_t = "failed", now
+        elif r < self.error_rate + self.stale_rate:
+            with self.lock:
+                self.injected[c.uid] = ("stale", now)
+            self.stats["stale"] += 1
+            c.state, c.fault_t = "hung", now
+        elif r < self.error_rate + self.stale_rate + self.minor_rate:
+            self._write(c, "ERROR", "GUI_ERROR", "MINOR", {"msg": "simulated"})
+            self.stats["minor"] += 1
+        else:
+            self._write(c, "RUNNING", "OK", "INFO", {"fps": 55 + self.rng.randint(0, 5)})
+        c.next_t += self.interval
+
+    def _loop(self):
+        t0 = time.thread_time()
+        while not self.stop.wait(0.2):
+            now = time.time()
+            for c in self.clients:
+                try:
+                    self._tick(c, now)
+                except Exception as e:
+                    print("[!] sim writer:", e)
+        self.cpu = time.thread_time() - t0
+
+def _sim_monitor_class(writer, detections):
+    class SimMonitor(gt.RejoinMonitor):
+        def _schedule_rejoin(self, uid, event_t=None, cause="", extra=0):
+            with writer.lock:
+                fault = writer.injected.pop(uid, None)
+            if fault is not None:
+                detections.append((fault[0], time.time() - fault[1]))
+            return super()._schedule_rejoin(uid, event_t, cause, extra)
+    return SimMonitor
+
+def simulate(n, duration=30.0, base_dir=None, fmt="json", interval=5.0, error_rate=0.01,
+             stale_rate=0.002, boot=3.0, extra_cfg=None):
+    import contextlib, resource, shutil, tempfile
+    base_dir = base_dir or tempfile.mkdtemp(prefix="gpt-sim-")
+    sim_dir = os.path.join(base_dir, f"n{n}")
+    shutil.rmtree(sim_dir, ignore_errors=True)
+    sim_install_shims(sim_dir)
+    sim_set_workdir(os.path.join(sim_dir, "work"))
+    ws = os.path.join(sim_dir, "ws")
+    gt.ensure_dir(os.path.join(ws, gt.REPORT_DIRNAME))
+    sink = SimWebhookSink()
+    cfg = dict(gt.DEFAULT_CONFIG)
+    cfg.update({"exec_workspace": [ws], "webhook_url": sink.url, "status_format": fmt,
+                "report_interval_min": 60, "first_rejoin_delay": 0, "rejoin_jitter": [0, 1],
+                "heartbeat_stale": int(max(10, 3 * interval)), "cold_start": False})
+    cfg.update(extra_cfg or {})
+    gt.CONFIG_STORE.save(cfg)
+    accounts, clients, procs = {}, [], []
+    for i in range(n):
+        uid, pkg = str(1000000 + i), f"com.sim.client{i:04d}"
+        accounts[uid] = {"username": f"sim{i}", "pkg": pkg, "gid": ""}
+        clients.append(SimClient(uid, pkg, os.path.join(ws, gt.REPORT_DIRNAME, f"status_{uid}.log")))
+        procs.append(sim_spawn(sim_dir, pkg))
+    gt.ACCOUNTS_STORE.save(accounts)
+    writer = SimWriter(sim_dir, clients, fmt, interval, error_rate, stale_rate, boot=boot)
+    detections = []
+    peak_threads = 0
+    with open(os.path.join(sim_dir, "monitor.log"), "w", buffering=1) as log, contextlib.redirect_stdout(log):
+        ru0, t0 = resource.getrusage(resource.RUSAGE_SELF), time.time()
+        mon = _sim_monitor_class(writer, detections)(gt.load_config())
+        writer.start()
+        while time.time() - t0 < duration:
+            time.sleep(0.5)
+            peak_threads = max(peak_threads, threading.active_count())
+        writer.stop.set()
+        writer.thread.join(5)
+        elapsed = time.time() - t0
+        # one status report through the real delivery path; the sink must see it
+        webhooks = gt.optional_import("requests") is not None
+        if webhooks:
+            try:
+                gt.send_status_webhook(mon.cfg, mon)
+            except Exception as e:
+                print("[!] status webhook failed:", e)
+            deadline = time.time() + 15
+            while not sink.posts and time.time() < deadline:
+                time.sleep(0.2)
+        ru1 = resource.getrusage(resource.RUSAGE_SELF)
+        succeeded = sum(v for (fam, _l), v in mon.metrics.items() if fam == "gpt_rejoins_succeeded")
+        attempted = sum(v for (fam, _l), v in mon.metrics.items() if fam == "gpt_rejoins_attempted")
+        parsed = sum(v for (fam, _l), v in mon.metrics.items() if fam == "gpt_records_parsed")
+        mon.stop_all()
+    sink.close()
+    sim_kill_all(sim_dir)
+    for p in procs:
+        p.kill()
+        p.wait()
+    pct = gt.LatencyStats.percentiles
+    sev = [d * 1000 for k, d in detections if k == "severe"]
+    stale = [d for k, d in detections if k == "stale"]
+    cpu = (ru1.ru_utime + ru1.ru_stime) - (ru0.ru_utime + ru0.ru_stime) - writer.cpu
+    return {
+        "accounts": n, "duration_s": round(elapsed, 1), "records": writer.stats["records"], "parsed": parsed,
+        "severe": writer.stats["severe"], "stale": writer.stats["stale"],
+        "detect_ms": {k: round(v, 1) for k, v in pct(sev).items()},
+        "stale_detect_s": {k: round(v, 1) for k, v in pct(stale).items()},
+        "rejoins_attempted": attempted, "rejoins_succeeded": succeeded,
+        "rejoins_per_min": round(succeeded * 60 / elapsed, 1),
+        "heal_s": {k: round(v, 1) for k, v in pct(writer.stats["heals"]).items()},
+        "peak_threads": peak_threads, "monitor_cpu_pct": round(100 * cpu / elapsed, 1),
+        "max_rss_mb": round(ru1.ru_maxrss / 1024, 1), "webhook_posts": sink.posts,
+        "webhook_ok": sink.posts > 0 if webhooks else None,
+        "calls": sim_calls(sim_dir), "dir": sim_dir,
+    }
+
+def cmd_simulate(args):
+    # simulate [--accounts 10,100,500] [--duration 30] [--interval 5] [--error-rate 0.01]
+    #          [--stale-rate 0.002] [--boot 3] [--format json|compact] [--dir PATH] [--out results.json]
+    opts = dict(zip(args[::2], args[1::2]))
+    sizes = [int(x) for x in opts.get("--accounts", "10,100,500").split(",") if x.strip()]
+    results = []
+    for n in sizes:
+        print(f"[i] Simulating {n} accounts for {opts.get('--duration', 30)}s ...")
+        r = simulate(n, float(opts.get("--duration", 30)), opts.get("--dir"), opts.get("--format", "json"),
+                     float(opts.get("--interval", 5)), float(opts.get("--error-rate", 0.01)),
+                     float(opts.get("--stale-rate", 0.002)), float(opts.get("--boot", 3)))
+        results.append(r)
+        d, h = r["detect_ms"], r["heal_s"]
+        print(f"    records {r['records']} written / {r['parsed']} parsed, severe {r['severe']}, stale {r['stale']}")
+        print(f"    detect p50 {d.get('p50', '-')} ms p99 {d.get('p99', '-')} ms, stale detect p50 "
+              f"{r['stale_detect_s'].get('p50', '-')} s")
+        print(f"    rejoins {r['rejoins_succeeded']}/{r['rejoins_attempted']} ({r['rejoins_per_min']}/min), "
+              f"heal p50 {h.get('p50', '-')} s p99 {h.get('p99', '-')} s")
+        print(f"    threads {r['peak_threads']}, monitor CPU {r['monitor_cpu_pct']}%, max RSS {r['max_rss_mb']} MB, "
+              f"webhook posts {r['webhook_posts']}, calls {r['calls']}")
+        print(f"    logs in {r['dir']}")
+        if r["webhook_ok"] is None:
+            print("[!] requests module missing; webhook delivery not exercised")
+        elif not r["webhook_ok"]:
+            print("[!] Webhook enabled but nothing reached the sink")
+    if opts.get("--out"):
+        with open(opts["--out"], "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[✓] Results written to {opts['--out']}")
+    return 1 if any(r["webhook_ok"] is False for r in results) else 0
+
+# --- Status format benchmark: JSON vs compact ---
+# heartbeat-heavy record mix shared by the benchmarks
+BENCH_STATUS_MIX = [("RUNNING", "OK", "INFO", {"fps": 60})] * 30 + [
+    ("ERROR", "ERROR_277", "SEVERE", {"msg": "Lost connection to the game server, please reconnect (Error Code: 277)"}),
+    ("TELEPORT_BEGIN", "", "INFO", {}),
+    ("ERROR", "GUI_ERROR", "MINOR", {"msg": "Something went wrong"}),
+]
+
+def bench_status_format(n=20000, rounds=3):
+    # parse throughput and bytes per record, JSON vs compact, on a heartbeat-heavy mix
+    mix = BENCH_STATUS_MIX
+    results = {}
+    for fmt in ("json", "compact"):
+        lines = [gt.format_status_line(fmt, 1700000000 + i, *mix[i % len(mix)], uid=1234567890, user="SomePlayerName")
+                 for i in range(n)]
+        hb = gt.format_status_line(fmt, 1700000000, "RUNNING", "OK", "INFO", {"fps": 60}, uid=1234567890, user="SomePlayerName")
+        best = None
+        for _ in range(rounds):
+            t = time.perf_counter()
+            for ln in lines:
+                gt.parse_status_line(ln)
+            dt = time.perf_counter() - t
+            best = dt if best is None else min(best, dt)
+        results[fmt] = {
+            "bytes_per_heartbeat": len(hb.encode("utf-8")) + 1,
+            "avg_bytes_per_record": round(sum(len(ln.encode("utf-8")) + 1 for ln in lines) / n, 1),
+            "records_per_s": int(n / best),
+            "us_per_record": round(best / n * 1e6, 2),
+        }
+    return results
+
+def cmd_bench_format(args):
+    n = int(args[0]) if args else 20000
+    res = bench_status_format(n)
+    print(f"{'format':<8} {'B/heartbeat':>12} {'avg B/rec':>10} {'records/s':>12} {'us/rec':>8}")
+    for fmt, r in res.items():
+        print(f"{fmt:<8} {r['bytes_per_heartbeat']:>12} {r['avg_bytes_per_record']:>10} {r['records_per_s']:>12} {r['us_per_record']:>8}")
+    j, c = res["json"], res["compact"]
+    print(f"compact vs json: {c['records_per_s'] / j['records_per_s']:.2f}x parse speed, "
+          f"{c['bytes_per_heartbeat'] / j['bytes_per_heartbeat']:.0%} of heartbeat bytes")
+    return 0
+
+# --- Microbenchmarks: per-record path, appStorage parsing, process listing ---
+BENCH_SEED = 1337
+BENCH_APPSTORAGE_KB = 400      # real clients carry a few hundred KB of cached settings/experiments
+BENCH_THRESHOLD_PCT = 25       # --compare flags throughput drops / p99 or peak memory rises above this
+BENCH_MIN_ROUNDS = 3           # --compare works on medians; fewer rounds are too noisy to diff
+
+def bench_fixtures(seed=BENCH_SEED, n=5000):
+    # deterministic fixtures: realistic status lines, malformed lines, a large appStorage.json
+    import random
+    rng = random.Random(seed)
+    mix = BENCH_STATUS_MIX
+    status = {fmt: [gt.format_status_line(fmt, 1700000000 + i, *mix[rng.randrange(len(mix))],
+                                       uid=1234567890, user="SomePlayerName") for i in range(n)]
+              for fmt in ("json", "compact")}
+    good = status["json"][0]
+    bad = [
+        good[:len(good) // 2],                      # torn write
+        "",
+        "   ",
+        "Lost connection to the game server",       # stray print
+        "~1|1700000000|0|0",                        # compact, short
+        "~1|notatime|0|0|OK|60|",
+        "[1, 2, 3]",
+        '{"t": 1700000000, "event": "RUNNING", "code": "OK", "severity": "INFO", "details": {',
+        "\x00\x00\x00\x00" * 8,                      # zero-filled tail after power loss
+        good.replace('"', "'"),
+    ]
+    malformed = [bad[i % len(bad)] for i in range(n)]
+    data = {"AppInstallationId": f"{rng.getrandbits(64):x}", "BrowserTrackerId": str(rng.getrandbits(40))}
+    i = 0
+    while len(json.dumps(data)) < BENCH_APPSTORAGE_KB * 1024:
+        data[f"FFlag_Experiment_{i}"] = {"v": rng.getrandbits(32), "rollout": rng.random(), "tag": f"{rng.getrandbits(128):032x}"}
+        i += 1
+    data["Username"] = "SomePlayerName"
+    data["UserId"] = "1234567890"
+    app_json = json.dumps(data)
+    app_broken = app_json[:-1] + ',"LastSaved":'     # truncated by an interrupted write -> regex fallback
+    return {"status": status, "malformed": malformed, "app_json": app_json, "app_broken": app_broken}
+
+def _bench_case(fn, items, rounds=5, sample=2000, peak_sample=200):
+    # every round: one timed pass (throughput) + per-call timings on a sample (p50/p99); medians across rounds
+    import statistics, tracemalloc
+    ops, p50s, p99s = [], [], []
+    for _ in range(rounds):
+        t = time.perf_counter()
+        for x in items:
+            fn(x)
+        ops.append(len(items) / (time.perf_counter() - t))
+        calls = []
+        for x in items[:sample]:
+            t = time.perf_counter_ns()
+            fn(x)
+            calls.append(time.perf_counter_ns() - t)
+        p = gt.LatencyStats.percentiles(calls, (50, 99))
+        p50s.append(p["p50"])
+        p99s.append(p["p99"])
+    # peak traced bytes above the pre-call level, averaged per call: what one call holds at its
+    # high-water mark (tracemalloc cannot count individual allocations). too slow for the timed passes
+    tracemalloc.start()
+    peak = 0
+    subset = items[:peak_sample]
+    for x in subset:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(x)
+        peak += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    med = statistics.median
+    spread = lambda vals: round((max(vals) - min(vals)) * 100.0 / med(vals), 1) if med(vals) else 0.0
+    return {
+        "rounds": rounds,
+        "ops_per_s": int(med(ops)),
+        "us_per_op": round(1e6 / med(ops), 2),
+        "p50_us": round(med(p50s) / 1000, 2),
+        "p99_us": round(med(p99s) / 1000, 2),
+        "ops_spread_pct": spread(ops),     # (max - min) / median across rounds: this run's noise floor
+        "p99_spread_pct": spread(p99s),
+        "peak_b": int(peak / len(subset)),
+    }
+
+def bench_hot_paths(n=5000, accounts=100, rounds=5):
+    import tempfile
+    fx = bench_fixtures(n=n)
+    last_seen = {}
+    rules = gt.RuleSet(gt.DEFAULT_RULES)
+
+    def record(ln):
+        # _handle_line minus queue/metrics/event-store side effects
+        rec = gt.parse_status_line(ln)
+        if not rec:
+            return
+        last_seen["1234567890"] = int(rec.get("t", 0))
+        rules.classify(rec)
+
+    # the same compact lines as written by the generated Lua, already matched on the client
+    tagged = []
+    for ln in fx["status"]["compact"]:
+        v = rules.classify(gt.parse_status_line(ln))
+        tagged.append(f"{ln}|{v['idx']}@{rules.version}")
+    results = {
+        "record_json": _bench_case(record, fx["status"]["json"], rounds),
+        "record_compact": _bench_case(record, fx["status"]["compact"], rounds),
+        "record_client_rule": _bench_case(record, tagged, rounds),
+        "record_malformed": _bench_case(record, fx["malformed"], rounds),
+        "appstorage_json": _bench_case(gt._parse_appStorage, [fx["app_json"]] * 20, rounds, peak_sample=5),
+        "appstorage_regex": _bench_case(gt._parse_appStorage, [fx["app_broken"]] * 20, rounds, peak_sample=5),
+    }
+    # process listing against a throwaway accounts file (removed afterwards); the cached case is
+    # the normal in-TTL call
+    prev = gt.ACCOUNTS_STORE
+    with tempfile.TemporaryDirectory(prefix="gpt-bench-") as tmp:
+        gt.ACCOUNTS_STORE = gt.JsonStore(os.path.join(tmp, "accounts.json"))
+        try:
+            gt.ACCOUNTS_STORE.save({str(1000000 + i): {"username": f"bench{i}", "pkg": f"com.bench.client{i:04d}"}
+                                    for i in range(accounts)})
+            results["proc_list_cached"] = _bench_case(lambda _x: gt.count_roblox_processes_and_list(),
+                                                      list(range(200)), rounds)
+
+            def scan(_x):
+                gt._proc_cache["t"] = 0
+                gt.count_roblox_processes_and_list()
+
+            results["proc_list_scan"] = _bench_case(scan, list(range(20)), rounds, peak_sample=5)
+        finally:
+            gt.ACCOUNTS_STORE = prev
+    return {"python": sys.version.split()[0], "n": n, "accounts": accounts, "rounds": rounds,
+            "appstorage_kb": len(fx["app_json"]) // 1024, "results": results}
+
+def bench_compare(cur, base, threshold=BENCH_THRESHOLD_PCT):
+    # case -> (ops %, p99 %, peak %, regressed); a change only counts past the threshold and past
+    # the round-to-round spread measured in either run. baselines from before peak_b skip that column
+    out = {}
+    pct = lambda new, old: (new - old) * 100.0 / old if old else 0.0
+    for case, r in cur["results"].items():
+        b = base.get("results", {}).get(case)
+        if not b:
+            continue
+        d_ops = pct(r["ops_per_s"], b["ops_per_s"])
+        d_p99 = pct(r["p99_us"], b["p99_us"])
+        d_peak = pct(r["peak_b"], b["peak_b"]) if "peak_b" in b else 0.0
+        ops_noise = max(threshold, r.get("ops_spread_pct", 0), b.get("ops_spread_pct", 0))
+        p99_noise = max(threshold, r.get("p99_spread_pct", 0), b.get("p99_spread_pct", 0))
+        out[case] = (d_ops, d_p99, d_peak, d_ops < -ops_noise or d_p99 > p99_noise or d_peak > threshold)
+    return out
+
+def cmd_bench(args):
+    # bench [--n 5000] [--accounts 100] [--rounds 5] [--save PATH] [--compare PATH] [--threshold PCT]
+    opts = dict(zip(args[::2], args[1::2]))
+    rounds = int(opts.get("--rounds", 5))
+    base = gt.load_json(opts["--compare"], None) if opts.get("--compare") else None
+    if opts.get("--compare"):
+        if not base:
+            print(f"[!] No baseline at {opts['--compare']}")
+            return 2
+        if rounds < BENCH_MIN_ROUNDS or base.get("rounds", 1) < BENCH_MIN_ROUNDS:
+            print(f"[!] --compare needs medians of at least {BENCH_MIN_ROUNDS} rounds in both runs "
+                  f"(baseline: {base.get('rounds', 1)}, now: {rounds})")
+            return 2
+    res = bench_hot_paths(int(opts.get("--n", 5000)), int(opts.get("--accounts", 100)), rounds)
+    threshold = float(opts.get("--threshold", BENCH_THRESHOLD_PCT))
+    diff = bench_compare(res, base, threshold) if base else {}
+    print(f"[i] {res['n']} records/fixture, {res['accounts']} accounts, appStorage {res['appstorage_kb']} KB, "
+          f"median of {rounds} rounds, python {res['python']}")
+    head = f"{'case':<18} {'ops/s':>10} {'±%':>5} {'us/op':>9} {'p99 us':>9} {'peak B/op':>9}"
+    print(head + (f" {'Δops':>7} {'Δp99':>7} {'Δpeak':>7}" if base else ""))
+    for case, r in res["results"].items():
+        row = (f"{case:<18} {r['ops_per_s']:>10} {r['ops_spread_pct']:>5.0f} {r['us_per_op']:>9} "
+               f"{r['p99_us']:>9} {r['peak_b']:>9}")
+        if case in diff:
+            d_ops, d_p99, d_peak, bad = diff[case]
+            row += f" {d_ops:>+6.0f}% {d_p99:>+6.0f}% {d_peak:>+6.0f}%" + ("  [!]" if bad else "")
+        print(row)
+    if opts.get("--save"):
+        gt.save_json(opts["--save"], res)
+        print(f"[✓] Baseline saved to {opts['--save']}")
+    if base:
+        regressed = [c for c, d in diff.items() if d[3]]
+        if regressed:
+            print(f"[!] Regression (>{threshold:g}% and above run-to-run noise) in: {', '.join(regressed)}")
+            return 1
+        print(f"[✓] No regression against {opts['--compare']}")
+    return 0
+
+# --- Rules compatibility: DEFAULT_RULES against the hard-coded check they replaced ---
+def legacy_is_severe(rec):
+    # RejoinMonitor._is_severe before rules.json, kept verbatim as the reference
+    if not rec:
+        return False
+    sev = (rec.get("severity","") or "").upper()
+    event = (rec.get("event","") or "").upper()
+    code = (rec.get("code","") or "").upper()
+    if sev == "SEVERE":
+        return True
+    if event in ("KICK", "CRASH", "DISCONNECT"):
+        return True
+    if "HEARTBEAT_STALE" in code or "PLAYER_REMOVED" in code:
+        return True
+    if code.startswith("ERROR_268") or code.startswith("ERROR_277"):
+        return True
+    return False
+
+RULES_CORPUS_EVENTS = ("RUNNING", "ERROR", "KICK", "kick", "CRASH", "DISCONNECT", "TELEPORT_BEGIN", "TELEPORT_END", "")
+RULES_CORPUS_SEVERITIES = ("INFO", "MINOR", "SEVERE", "severe", "")
+RULES_CORPUS_CODES = (
+    "OK", "INIT_OK", "SEGMENT", "GUI_ERROR", "", "KICK_OR_DISCONNECT", "BIND_CLOSE",
+    "ERROR_277", "ERROR_2770", "error_277", "ERROR_268", "ERROR_268_RETRY", "X_ERROR_277",
+    "PLAYER_REMOVED", "CLIENT_PLAYER_REMOVED", "player_removed_by_server",
+    "HEARTBEAT_STALE", "LUA_HEARTBEAT_STALE_2", "heartbeat_stale", "HEARTBEAT", "STALE",
+)
+RULES_CORPUS_MSGS = (None, "", "You were kicked", "Error Code: 277", "Something went wrong")
+
+def rules_compat(rules=None):
+    # -> (checked, [(rec, legacy, verdict name, action)]) for every corpus record where they disagree
+    import itertools
+    rules = rules or gt.RuleSet(gt.DEFAULT_RULES)
+    bad, n = [], 0
+    for ev, sv, code, msg in itertools.product(RULES_CORPUS_EVENTS, RULES_CORPUS_SEVERITIES,
+                                               RULES_CORPUS_CODES, RULES_CORPUS_MSGS):
+        rec = {"event": ev, "severity": sv, "code": code, "details": {"msg": msg} if msg is not None else {}}
+        n += 1
+        v = rules.classify(rec)
+        if legacy_is_severe(rec) != (v["action"] == "rejoin"):
+            bad.append((rec, legacy_is_severe(rec), v["name"], v["action"]))
+    return n, bad
+
+def cmd_rules_compat(args):
+    # rules-compat [rules.json]: default (or given) rules vs the legacy check; exit 1 on any difference
+    rules = gt.RuleSet(gt.load_json(args[0], {})) if args else None
+    n, bad = rules_compat(rules)
+    for rec, legacy, name, action in bad[:20]:
+        print(f"[!] {rec['event']}/{rec['severity']}/{rec['code']} msg={rec['details'].get('msg')!r}: "
+              f"legacy {'rejoin' if legacy else 'ignore'}, rules {action} ({name})")
+    print(f"{'[✓]' if not bad else '[!]'} {n - len(bad)}/{n} corpus records agree with the legacy check")
+    return 1 if bad else 0
+
+# --- Startup benchmark: launcher + cached module against a bare interpreter ---
+STARTUP_BUDGET_MS = 150   # tool import + CLI dispatch on top of a bare interpreter
+STARTUP_HEADROOM = 0.8     # bench-startup fails once overhead passes this fraction of the budget
+LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(gt.__file__)), "GPT-Tool-v2.py")
+STARTUP_HEAVY = ("requests", "urllib3", "psutil", "PIL", "sqlite3", "http", "socketserver")
+
+def _parse_importtime(stderr):
+    # -X importtime lines -> [(name, depth, self_us, cumulative_us)]
+    out = []
+    for ln in stderr.splitlines():
+        if not ln.startswith("import time:"):
+            continue
+        parts = ln[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        out.append((name.strip(), depth, int(parts[0]), int(parts[1])))
+    return out
+
+def bench_startup(runs=5):
+    import importlib.util
+    me = LAUNCHER
+
+    def median_ms(argv):
+        times = []
+        for _ in range(runs):
+            t = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append((time.perf_counter() - t) * 1000)
+        return sorted(times)[len(times) // 2]
+
+    bare = median_ms([sys.executable, "-c", "pass"])
+    # first run writes __pycache__/gpt_tool.*.pyc; the timed runs load it
+    subprocess.run([sys.executable, me, "help"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    tool = median_ms([sys.executable, me, "help"])
+    trace = lambda argv: _parse_importtime(subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv, stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE, text=True).stderr)
+    base = {name for name, _d, _s, _c in trace(["-c", "pass"])}
+    imports = [r for r in trace([me, "help"]) if r[0] not in base]
+    top = sorted((r for r in imports if r[1] == 0), key=lambda r: -r[3])
+    heavy = sorted({name for name, _d, _s, _c in imports if name.split(".")[0] in STARTUP_HEAVY})
+    # the launcher script is compiled on every start; the module must come from __pycache__
+    with open(me, encoding="utf-8") as f:
+        src = f.read()
+    t = time.perf_counter()
+    compile(src, me, "exec")
+    compile_ms = (time.perf_counter() - t) * 1000
+    cached = os.path.exists(importlib.util.cache_from_source(os.path.abspath(gt.__file__)))
+    return {"bare_ms": round(bare, 1), "tool_ms": round(tool, 1), "overhead_ms": round(tool - bare, 1),
+            "compile_ms": round(compile_ms, 1), "cached": cached,
+            "imports_ms": round(sum(r[3] for r in top) / 1000, 1), "top": top, "heavy": heavy}
+
+def cmd_bench_startup(args):
+    # bench-startup [--budget MS] [--runs N]; exit 1 near the budget (STARTUP_HEADROOM), when a heavy
+    # module loads eagerly, or when the module is not served from __pycache__
+    opts = dict(zip(args[::2], args[1::2]))
+    budget = float(opts.get("--budget", STARTUP_BUDGET_MS))
+    res = bench_startup(int(opts.get("--runs", 5)))
+    print(f"bare interpreter   {res['bare_ms']:>7} ms")
+    print(f"tool (help)        {res['tool_ms']:>7} ms")
+    print(f"overhead           {res['overhead_ms']:>7} ms  (budget {budget:g} ms, fail above {budget * STARTUP_HEADROOM:g} ms)")
+    print(f"  compile launcher {res['compile_ms']:>7} ms")
+    print(f"  module bytecode  {'cached' if res['cached'] else 'NOT cached':>10}")
+    print(f"  imports          {res['imports_ms']:>7} ms")
+    print(f"\n{'cumulative':>10} {'self':>8}  module")
+    for name, _d, self_us, cum_us in res["top"][:12]:
+        print(f"{cum_us / 1000:>8.1f}ms {self_us / 1000:>6.1f}ms  {name}")
+    ok = res["overhead_ms"] <= budget * STARTUP_HEADROOM and not res["heavy"] and res["cached"]
+    if res["heavy"]:
+        print(f"\n[!] Heavy modules imported at startup: {', '.join(res['heavy'])}")
+    if not res["cached"]:
+        print(f"\n[!] No cached bytecode for {gt.__file__}; every start recompiles it (read-only directory?)")
+    print(f"\n{'[✓] Within budget' if ok else '[!] Startup regression'}")
+    return 0 if ok else 1
+
+COMMANDS = {
+    "bench": cmd_bench,
+    "bench-format": cmd_bench_format,
+    "bench-startup": cmd_bench_startup,
+    "rules-compat": cmd_rules_compat,
+    "simulate": cmd_simulate,
+}
+
+def main(argv):
+    fn = COMMANDS.get(argv[0]) if argv else None
+    if fn is None:
+        print(f"usage: gpt_dev.py <command> [args]   commands: {', '.join(sorted(COMMANDS))}")
+        return 2
+    return fn(argv[1:]) or 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))